@@ -0,0 +1,7 @@
+"""Shared Pydantic configuration for PrepWise models."""
+
+from pydantic import ConfigDict
+
+# Build each model's validator and serializer on first use instead of at import, so modules
+# that import models they never touch don't pay for them; everything else is Pydantic's default
+MODEL_CONFIG = ConfigDict(defer_build=True)
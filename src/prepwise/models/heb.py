@@ -3,10 +3,14 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 
+from prepwise.models.base import MODEL_CONFIG
+
 
 class HEBCartItem(BaseModel):
     """A single item added to the HEB cart."""
 
+    model_config = MODEL_CONFIG
+
     search_term: str = Field(description="Original search term used")
     product_name: Optional[str] = Field(default=None, description="Actual product name found")
     price: Optional[float] = Field(default=None, description="Item price")
@@ -21,6 +25,8 @@ class HEBCartItem(BaseModel):
 class HEBCartResult(BaseModel):
     """Result of adding items to HEB cart."""
 
+    model_config = MODEL_CONFIG
+
     items: list[HEBCartItem] = Field(default_factory=list, description="All items processed")
     total_added: int = Field(default=0, description="Number of items successfully added")
     total_not_found: int = Field(default=0, description="Number of items not found")
@@ -40,38 +46,50 @@ class HEBCartResult(BaseModel):
 
     def summary(self) -> str:
         """Generate a human-readable summary of the cart operation."""
-        lines = [
-            "HEB Cart Summary",
-            "=" * 40,
-            "",
-        ]
-
-        if self.added_items:
-            lines.append(f"Added ({len(self.added_items)} items):")
-            for item in self.added_items:
-                price_str = f" - ${item.price:.2f}" if item.price else ""
-                name = item.product_name or item.search_term
-                lines.append(f"  - {name}{price_str}")
-            lines.append("")
-
-        if self.failed_items:
-            lines.append(f"Not Found ({len(self.failed_items)} items):")
-            for item in self.failed_items:
-                suggestion = f" -> Try: {item.suggestion}" if item.suggestion else ""
-                lines.append(f"  - {item.search_term}{suggestion}")
-            lines.append("")
-
-        if self.cart_total:
-            lines.append(f"Estimated Total: ${self.cart_total:.2f}")
-
-        lines.append(f"Review cart: {self.cart_url}")
-
-        return "\n".join(lines)
+        # Partition in one pass rather than scanning items once per property
+        added: list[HEBCartItem] = []
+        failed: list[HEBCartItem] = []
+        for item in self.items:
+            (added if item.success else failed).append(item)
+
+        head = f"HEB Cart Summary\n{'=' * 40}\n"
+        added_section = (
+            (
+                f"Added ({len(added)} items):",
+                *(
+                    f"  - {item.product_name or item.search_term}"
+                    f"{f' - ${item.price:.2f}' if item.price else ''}"
+                    for item in added
+                ),
+                "",
+            )
+            if added
+            else ()
+        )
+        failed_section = (
+            (
+                f"Not Found ({len(failed)} items):",
+                *(
+                    f"  - {item.search_term}"
+                    f"{f' -> Try: {item.suggestion}' if item.suggestion else ''}"
+                    for item in failed
+                ),
+                "",
+            )
+            if failed
+            else ()
+        )
+        total = (f"Estimated Total: ${self.cart_total:.2f}",) if self.cart_total else ()
+        tail = f"Review cart: {self.cart_url}"
+
+        return "\n".join((head, *added_section, *failed_section, *total, tail))
 
 
 class HEBSessionStatus(BaseModel):
     """Status of the HEB browser session."""
 
+    model_config = MODEL_CONFIG
+
     logged_in: bool = Field(description="Whether user is logged in")
     session_exists: bool = Field(description="Whether a session directory exists")
     message: str = Field(description="Human-readable status message")
@@ -1,11 +1,17 @@
 """Preference data models for PrepWise."""
 
-from pydantic import BaseModel, Field
+import sys
+
+from pydantic import BaseModel, Field, field_validator
+
+from prepwise.models.base import MODEL_CONFIG
 
 
 class MacroTargets(BaseModel):
     """Daily macronutrient targets."""
 
+    model_config = MODEL_CONFIG
+
     daily_calories: int = Field(default=2000, description="Daily calorie target")
     daily_protein_g: int = Field(default=150, description="Daily protein target in grams")
     daily_carbs_g: int = Field(default=200, description="Daily carbohydrate target in grams")
@@ -19,6 +25,8 @@ class PreferenceProfile(BaseModel):
     Rating scale: -2 (strongly dislike) to +2 (love), 0 = neutral
     """
 
+    model_config = MODEL_CONFIG
+
     # Ingredient preferences: ingredient_name -> rating (-2 to +2)
     ingredients: dict[str, int] = Field(
         default_factory=dict, description="Ingredient preferences: -2 (hate) to +2 (love)"
@@ -49,75 +57,105 @@ class PreferenceProfile(BaseModel):
         default=False, description="Whether the user has completed initial preference setup"
     )
 
+    @field_validator("dietary_restrictions")
+    @classmethod
+    def _dedupe_restrictions(cls, value: list[str]) -> list[str]:
+        """Store restrictions sorted and unique, so they act like a set and bisect works."""
+        return sorted(set(value))
+
+    @staticmethod
+    def _partition(ratings: dict[str, int]) -> tuple[list[str], list[str]]:
+        """Split a ratings dict into (liked, disliked) keys in a single pass."""
+        liked: list[str] = []
+        disliked: list[str] = []
+        for key, value in ratings.items():
+            if value > 0:
+                liked.append(key)
+            elif value < 0:
+                disliked.append(key)
+        return liked, disliked
+
     def get_liked_ingredients(self) -> list[str]:
         """Get ingredients with positive ratings (+1 or +2)."""
-        return [k for k, v in self.ingredients.items() if v > 0]
+        return self._partition(self.ingredients)[0]
 
     def get_disliked_ingredients(self) -> list[str]:
         """Get ingredients with negative ratings (-1 or -2)."""
-        return [k for k, v in self.ingredients.items() if v < 0]
+        return self._partition(self.ingredients)[1]
 
     def get_liked_cuisines(self) -> list[str]:
         """Get cuisines with positive ratings (+1 or +2)."""
-        return [k for k, v in self.cuisines.items() if v > 0]
+        return self._partition(self.cuisines)[0]
 
     def get_disliked_cuisines(self) -> list[str]:
         """Get cuisines with negative ratings (-1 or -2)."""
-        return [k for k, v in self.cuisines.items() if v < 0]
+        return self._partition(self.cuisines)[1]
 
     def get_preferred_methods(self) -> list[str]:
         """Get cooking methods with positive ratings (+1 or +2)."""
-        return [k for k, v in self.cooking_methods.items() if v > 0]
-
-
-# Pre-populated questions for setup wizard
-COMMON_INGREDIENT_QUESTIONS = [
-    ("cilantro", "cilantro/coriander"),
-    ("mushrooms", "mushrooms"),
-    ("olives", "olives"),
-    ("spicy_food", "spicy food"),
-    ("seafood", "seafood"),
-    ("tofu", "tofu"),
-    ("avocado", "avocado"),
-    ("coconut", "coconut"),
-    ("blue_cheese", "blue cheese / strong cheeses"),
-    ("raw_onion", "raw onions"),
-    ("bell_peppers", "bell peppers"),
-    ("eggplant", "eggplant"),
-    ("beans", "beans/legumes"),
-    ("nuts", "nuts"),
-]
-
-COMMON_CUISINES = [
-    "Mexican",
-    "Italian",
-    "Chinese",
-    "Japanese",
-    "Indian",
-    "Thai",
-    "Mediterranean",
-    "American",
-    "Korean",
-    "Vietnamese",
-    "Middle Eastern",
-    "Greek",
-    "French",
-]
-
-COMMON_COOKING_METHODS = [
-    ("quick_meals", "Quick meals (under 30 min)"),
-    ("slow_cooker", "Slow cooker / crockpot"),
-    ("air_fryer", "Air fryer"),
-    ("grilling", "Grilling / BBQ"),
-    ("meal_prep", "Batch cooking / meal prep"),
-    ("one_pot", "One-pot meals"),
-    ("sheet_pan", "Sheet pan dinners"),
-    ("instant_pot", "Instant Pot / pressure cooker"),
-    ("stir_fry", "Stir fry"),
-    ("baking", "Baking"),
-]
-
-DIETARY_OPTIONS = [
+        return self._partition(self.cooking_methods)[0]
+
+
+# Pre-populated questions for setup wizard. Keys are interned since they double as
+# preference dict keys, which makes lookups for the common vocabulary pointer-equal.
+COMMON_INGREDIENT_QUESTIONS = tuple(
+    (sys.intern(key), label)
+    for key, label in (
+        ("cilantro", "cilantro/coriander"),
+        ("mushrooms", "mushrooms"),
+        ("olives", "olives"),
+        ("spicy_food", "spicy food"),
+        ("seafood", "seafood"),
+        ("tofu", "tofu"),
+        ("avocado", "avocado"),
+        ("coconut", "coconut"),
+        ("blue_cheese", "blue cheese / strong cheeses"),
+        ("raw_onion", "raw onions"),
+        ("bell_peppers", "bell peppers"),
+        ("eggplant", "eggplant"),
+        ("beans", "beans/legumes"),
+        ("nuts", "nuts"),
+    )
+)
+
+COMMON_CUISINES = tuple(
+    map(
+        sys.intern,
+        (
+            "Mexican",
+            "Italian",
+            "Chinese",
+            "Japanese",
+            "Indian",
+            "Thai",
+            "Mediterranean",
+            "American",
+            "Korean",
+            "Vietnamese",
+            "Middle Eastern",
+            "Greek",
+            "French",
+        ),
+    )
+)
+
+COMMON_COOKING_METHODS = tuple(
+    (sys.intern(key), label)
+    for key, label in (
+        ("quick_meals", "Quick meals (under 30 min)"),
+        ("slow_cooker", "Slow cooker / crockpot"),
+        ("air_fryer", "Air fryer"),
+        ("grilling", "Grilling / BBQ"),
+        ("meal_prep", "Batch cooking / meal prep"),
+        ("one_pot", "One-pot meals"),
+        ("sheet_pan", "Sheet pan dinners"),
+        ("instant_pot", "Instant Pot / pressure cooker"),
+        ("stir_fry", "Stir fry"),
+        ("baking", "Baking"),
+    )
+)
+
+DIETARY_OPTIONS = (
     "dairy-free",
     "gluten-free",
     "vegetarian",
@@ -129,4 +167,4 @@ DIETARY_OPTIONS = [
     "pescatarian",
     "halal",
     "kosher",
-]
+)
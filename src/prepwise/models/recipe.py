@@ -3,10 +3,27 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 
+from prepwise.models.base import MODEL_CONFIG
+
+# Timing line templates for Recipe.to_markdown, indexed by a bitmask of which
+# values are set: prep = 1, cook = 2, servings = 4
+_TIMING_TEMPLATES = (
+    None,
+    "Prep: {prep} min",
+    "Cook: {cook} min",
+    "Prep: {prep} min | Cook: {cook} min",
+    "Servings: {servings}",
+    "Prep: {prep} min | Servings: {servings}",
+    "Cook: {cook} min | Servings: {servings}",
+    "Prep: {prep} min | Cook: {cook} min | Servings: {servings}",
+)
+
 
 class RecipeIngredient(BaseModel):
     """A single ingredient in a recipe."""
 
+    model_config = MODEL_CONFIG
+
     name: str = Field(description="Ingredient name")
     quantity: Optional[str] = Field(default=None, description="Quantity (e.g., '2', '1/2')")
     unit: Optional[str] = Field(default=None, description="Unit (e.g., 'cups', 'lbs', 'cloves')")
@@ -31,6 +48,8 @@ class RecipeIngredient(BaseModel):
 class RecipeNutrition(BaseModel):
     """Estimated nutritional information per serving."""
 
+    model_config = MODEL_CONFIG
+
     calories: Optional[int] = Field(default=None, description="Calories per serving")
     protein_g: Optional[float] = Field(default=None, description="Protein in grams")
     carbs_g: Optional[float] = Field(default=None, description="Carbohydrates in grams")
@@ -42,6 +61,8 @@ class RecipeNutrition(BaseModel):
 class Recipe(BaseModel):
     """A complete recipe with all metadata."""
 
+    model_config = MODEL_CONFIG
+
     name: str = Field(description="Recipe name/title")
     description: Optional[str] = Field(default=None, description="Brief description of the dish")
 
@@ -107,39 +128,33 @@ class Recipe(BaseModel):
 
     def to_markdown(self) -> str:
         """Convert recipe to markdown format for Notion."""
-        lines = []
-
-        if self.description:
-            lines.append(self.description)
-            lines.append("")
+        intro = (self.description, "") if self.description else ()
 
         # Time info
-        time_parts = []
-        if self.prep_time_minutes:
-            time_parts.append(f"Prep: {self.prep_time_minutes} min")
-        if self.cook_time_minutes:
-            time_parts.append(f"Cook: {self.cook_time_minutes} min")
-        if self.servings:
-            time_parts.append(f"Servings: {self.servings}")
-        if time_parts:
-            lines.append(" | ".join(time_parts))
-            lines.append("")
-
-        # Ingredients
-        lines.append("**Ingredients**")
-        for ing in self.ingredients_raw or [str(i) for i in self.ingredients]:
-            lines.append(f"- {ing}")
-        lines.append("")
-
-        # Instructions
-        lines.append("**Instructions**")
-        for i, step in enumerate(self.instructions, 1):
-            lines.append(f"{i}. {step}")
-        lines.append("")
+        prep, cook, servings = self.prep_time_minutes, self.cook_time_minutes, self.servings
+        template = _TIMING_TEMPLATES[bool(prep) | bool(cook) << 1 | bool(servings) << 2]
+        timing = (template.format(prep=prep, cook=cook, servings=servings), "") if template else ()
 
-        # Source credit
-        if self.source_url:
-            source_text = self.source_name or "Source"
-            lines.append(f"*Recipe from [{source_text}]({self.source_url})*")
+        ingredients = (f"- {ing}" for ing in self.ingredients_raw or map(str, self.ingredients))
+        instructions = (f"{i}. {step}" for i, step in enumerate(self.instructions, 1))
 
-        return "\n".join(lines)
+        # Source credit
+        credit = (
+            (f"*Recipe from [{self.source_name or 'Source'}]({self.source_url})*",)
+            if self.source_url
+            else ()
+        )
+
+        return "\n".join(
+            (
+                *intro,
+                *timing,
+                "**Ingredients**",
+                *ingredients,
+                "",
+                "**Instructions**",
+                *instructions,
+                "",
+                *credit,
+            )
+        )
@@ -1,21 +1,22 @@
 """PrepWise MCP Server - Meal prep assistance tools."""
 
 import logging
-from typing import Literal
+import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from operator import itemgetter
+from typing import Any, Literal
 
 from mcp.server.fastmcp import FastMCP
+from pydantic import TypeAdapter, ValidationError
 
-from prepwise.models.preferences import (
-    COMMON_INGREDIENT_QUESTIONS,
-    COMMON_CUISINES,
-    COMMON_COOKING_METHODS,
-    DIETARY_OPTIONS,
-)
+from prepwise.models.heb import HEBCartResult
+from prepwise.models.preferences import PreferenceProfile
 from prepwise.tools import preferences as pref_tools
 from prepwise.tools import favorite_sites as sites_tools
-from prepwise.tools import recipe_parser
-from prepwise.tools import heb_cart
-from prepwise.tools import meal_history
+
+# recipe_parser, heb_cart and meal_history are imported inside their tools so
+# the server starts without loading recipe-scrapers or Playwright
 
 # Configure logging to stderr (important for MCP stdio servers)
 logging.basicConfig(
@@ -25,8 +26,94 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Fold journaled preference edits, then release the HEB browser and HTTP client."""
+    try:
+        yield
+    finally:
+        try:
+            pref_tools.compact_preferences()
+        except Exception as e:
+            logger.warning(f"Could not compact preferences on shutdown: {e}")
+        heb_cart = sys.modules.get("prepwise.tools.heb_cart")
+        if heb_cart is not None:
+            await heb_cart.shutdown_heb_browser()
+        recipe_parser = sys.modules.get("prepwise.tools.recipe_parser")
+        if recipe_parser is not None:
+            await recipe_parser.close_client()
+
+
 # Initialize FastMCP server
-mcp = FastMCP("prepwise")
+mcp = FastMCP("prepwise", lifespan=_lifespan)
+
+# Serializers built once at import so tool calls skip per-call schema lookup
+_PREFS_ADAPTER = TypeAdapter(PreferenceProfile)
+_HEB_ADAPTER = TypeAdapter(HEBCartResult)
+_SITES_ADAPTER = TypeAdapter(list[sites_tools.FavoriteSite])
+_RECIPES_ADAPTER = TypeAdapter(list[dict[str, Any]])
+
+
+def _emit(adapter: TypeAdapter, value: Any, extra: dict | None = None) -> dict | list:
+    """
+    Serialize a model to JSON-ready primitives in one pydantic-core pass.
+
+    mode="json" renders datetimes and other non-JSON types in Rust, so the
+    transport's JSON encoder has nothing left to convert.
+
+    Args:
+        adapter: Prebuilt TypeAdapter for the value's type
+        value: Model (or list of models) to serialize
+        extra: Optional keys merged into a dict payload
+
+    Returns:
+        The serialized payload
+    """
+    payload = adapter.dump_python(value, mode="json")
+    if extra:
+        payload.update(extra)
+    return payload
+
+
+# Rating label lookup, indexed by rating + 2 (ratings range from -2 to +2)
+_RATING_EMOJI = ("hate", "dislike", "neutral", "like", "love")
+
+
+def _rating_label(rating: int) -> str:
+    """Label a rating; hand-edited values outside -2..+2 show as neutral, as before."""
+    return _RATING_EMOJI[rating + 2] if -2 <= rating <= 2 else "neutral"
+
+
+# Bumped by every preference mutation tool; keys the rendered resource cache
+# and the last serialized profile
+_prefs_version = 0
+# Both hold (profile, version, value). The profile is the instance load_preferences()
+# returned; JSONStore keeps it identical only while the file is unchanged, so hand edits
+# miss the cache
+_rendered_cache: tuple[PreferenceProfile, int, str] | None = None
+_prefs_dump_cache: tuple[PreferenceProfile, int, dict] | None = None
+
+
+def _bump_prefs_version() -> None:
+    """Invalidate cached preference renderings after a mutation."""
+    global _prefs_version, _rendered_cache, _prefs_dump_cache
+    _prefs_version += 1
+    _rendered_cache = None
+    _prefs_dump_cache = None
+
+
+def _copy_payload(payload: dict) -> dict:
+    """Copy a serialized profile one level deep, so callers can't alter the cached one."""
+    return {k: v.copy() if isinstance(v, (dict, list)) else v for k, v in payload.items()}
+
+
+def _dump_prefs(prefs: PreferenceProfile) -> dict:
+    """Serialize a profile and remember it for the current preferences version."""
+    global _prefs_dump_cache
+    payload = _emit(_PREFS_ADAPTER, prefs)
+    _prefs_dump_cache = (prefs, _prefs_version, payload)
+    return _copy_payload(payload)
 
 
 # ============================================================================
@@ -49,6 +136,8 @@ async def prepwise_parse_recipe_url(url: str) -> dict:
         Structured recipe with name, ingredients, instructions,
         timing, servings, cuisine, and estimated nutrition
     """
+    from prepwise.tools import recipe_parser
+
     try:
         recipe = await recipe_parser.parse_recipe_url(url)
         return recipe.model_dump()
@@ -79,7 +168,10 @@ def prepwise_get_preferences() -> dict:
         - setup_completed: whether initial setup is done
     """
     prefs = pref_tools.load_preferences()
-    return prefs.model_dump()
+    cached = _prefs_dump_cache
+    if cached is not None and cached[0] is prefs and cached[1] == _prefs_version:
+        return _copy_payload(cached[2])
+    return _dump_prefs(prefs)
 
 
 @mcp.tool()
@@ -106,11 +198,59 @@ def prepwise_update_preference(
     """
     try:
         prefs = pref_tools.update_preference(category, item, rating)
-        return {"success": True, "preferences": prefs.model_dump()}
+        _bump_prefs_version()
+        return {"success": True, "preferences": _dump_prefs(prefs)}
     except ValueError as e:
         return {"success": False, "error": str(e)}
 
 
+@mcp.tool()
+def prepwise_update_preferences_batch(
+    updates: list[dict] | None = None,
+    add_dietary: list[str] | None = None,
+    remove_dietary: list[str] | None = None,
+) -> dict:
+    """
+    Update many food preferences at once, saving a single time.
+
+    Use this instead of repeated prepwise_update_preference calls when applying a
+    whole setup wizard's worth of answers. If any update is invalid, none are applied.
+
+    Args:
+        updates: List of {"category": ..., "item": ..., "rating": ...} objects, with the
+            same meaning as the prepwise_update_preference arguments
+        add_dietary: Dietary restrictions to add (e.g., ["dairy-free"])
+        remove_dietary: Dietary restrictions to remove
+
+    Returns:
+        Updated preference profile
+    """
+    triples = []
+    for u in updates or ():
+        if not isinstance(u, dict):
+            return {"success": False, "error": f"Each update must be an object: {u!r}"}
+        try:
+            category, item, rating = u["category"], u["item"], u["rating"]
+        except KeyError as e:
+            return {"success": False, "error": f"Each update needs category, item and rating: {e}"}
+        # Checked, not coerced: int(1.9) would quietly store the wrong rating
+        if not isinstance(category, str) or not isinstance(item, str):
+            return {"success": False, "error": f"Category and item must be strings: {u!r}"}
+        if type(rating) is not int:
+            return {"success": False, "error": f"Rating must be an integer: {rating!r}"}
+        triples.append((category, item, rating))
+
+    try:
+        prefs = pref_tools.update_preferences_batch(
+            triples, dietary_add=add_dietary, dietary_remove=remove_dietary
+        )
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+
+    _bump_prefs_version()
+    return {"success": True, "preferences": _dump_prefs(prefs)}
+
+
 @mcp.tool()
 def prepwise_update_macro_targets(
     daily_calories: int | None = None,
@@ -136,7 +276,8 @@ def prepwise_update_macro_targets(
         daily_carbs_g=daily_carbs_g,
         daily_fat_g=daily_fat_g,
     )
-    return {"success": True, "preferences": prefs.model_dump()}
+    _bump_prefs_version()
+    return {"success": True, "preferences": _dump_prefs(prefs)}
 
 
 @mcp.tool()
@@ -154,18 +295,9 @@ def prepwise_update_dietary_restrictions(
     Returns:
         Updated preference profile
     """
-    prefs = pref_tools.load_preferences()
-
-    if add:
-        for restriction in add:
-            pref_tools.add_dietary_restriction(restriction)
-
-    if remove:
-        for restriction in remove:
-            pref_tools.remove_dietary_restriction(restriction)
-
-    prefs = pref_tools.load_preferences()
-    return {"success": True, "preferences": prefs.model_dump()}
+    prefs = pref_tools.update_dietary_restrictions(add=add, remove=remove)
+    _bump_prefs_version()
+    return {"success": True, "preferences": _dump_prefs(prefs)}
 
 
 @mcp.tool()
@@ -184,13 +316,7 @@ def prepwise_get_setup_questions() -> dict:
         - dietary_options: list of dietary restriction options
         - needs_setup: whether user still needs to complete setup
     """
-    return {
-        "ingredients": COMMON_INGREDIENT_QUESTIONS,
-        "cuisines": COMMON_CUISINES,
-        "cooking_methods": COMMON_COOKING_METHODS,
-        "dietary_options": DIETARY_OPTIONS,
-        "needs_setup": pref_tools.needs_setup(),
-    }
+    return {**pref_tools.get_setup_questions(), "needs_setup": pref_tools.needs_setup()}
 
 
 @mcp.tool()
@@ -204,7 +330,8 @@ def prepwise_complete_setup() -> dict:
         Updated preference profile
     """
     prefs = pref_tools.complete_setup()
-    return {"success": True, "preferences": prefs.model_dump()}
+    _bump_prefs_version()
+    return {"success": True, "preferences": _dump_prefs(prefs)}
 
 
 # ============================================================================
@@ -226,7 +353,7 @@ def prepwise_get_favorite_sites() -> dict:
     """
     sites = sites_tools.load_favorite_sites()
     return {
-        "sites": [s.model_dump() for s in sites.sites],
+        "sites": _emit(_SITES_ADAPTER, sites.sites),
         "domains": sites.get_site_domains(),
     }
 
@@ -246,7 +373,7 @@ def prepwise_add_favorite_site(url: str, name: str) -> dict:
     sites = sites_tools.add_favorite_site(url, name)
     return {
         "success": True,
-        "sites": [s.model_dump() for s in sites.sites],
+        "sites": _emit(_SITES_ADAPTER, sites.sites),
     }
 
 
@@ -264,7 +391,7 @@ def prepwise_remove_favorite_site(url: str) -> dict:
     sites = sites_tools.remove_favorite_site(url)
     return {
         "success": True,
-        "sites": [s.model_dump() for s in sites.sites],
+        "sites": _emit(_SITES_ADAPTER, sites.sites),
     }
 
 
@@ -307,8 +434,11 @@ async def prepwise_get_heb_session_status() -> dict:
         - session_exists: whether a session directory exists
         - message: human-readable status message
     """
+    from prepwise.tools import heb_cart
+
     status = await heb_cart.check_session_status()
-    return status.model_dump()
+    # Flat model of primitives - no serializer needed
+    return dict(status.__dict__)
 
 
 @mcp.tool()
@@ -324,6 +454,8 @@ async def prepwise_heb_login() -> dict:
         - success: whether browser was opened successfully
         - message: instructions for the user
     """
+    from prepwise.tools import heb_cart
+
     try:
         message = await heb_cart.open_heb_login()
         return {"success": True, "message": message}
@@ -354,12 +486,11 @@ async def prepwise_add_to_heb_cart(ingredients: list[str]) -> dict:
         - cart_url: URL to view cart
         - summary: human-readable summary
     """
+    from prepwise.tools import heb_cart
+
     try:
         result = await heb_cart.add_items_to_cart(ingredients)
-        return {
-            **result.model_dump(),
-            "summary": result.summary(),
-        }
+        return _emit(_HEB_ADAPTER, result, {"summary": result.summary()})
     except Exception as e:
         logger.exception(f"Error adding to HEB cart: {e}")
         return {"error": str(e)}
@@ -371,7 +502,10 @@ async def prepwise_add_to_heb_cart(ingredients: list[str]) -> dict:
 
 
 @mcp.tool()
-def prepwise_analyze_meal_history(recipes: list[dict]) -> dict:
+def prepwise_analyze_meal_history(
+    recipes: list[dict] | None = None,
+    recipes_json: str | None = None,
+) -> dict:
     """
     Analyze meal history to learn preferences from past meals.
 
@@ -388,6 +522,8 @@ def prepwise_analyze_meal_history(recipes: list[dict]) -> dict:
             - Rating: str ("1" to "5")
             - Prep Time: int (minutes, optional)
             - Cook Time: int (minutes, optional)
+        recipes_json: The same recipe list as a JSON array string. Preferred for
+            large exports since it is parsed and validated in a single pass.
 
     Returns:
         Dictionary with:
@@ -410,6 +546,16 @@ def prepwise_analyze_meal_history(recipes: list[dict]) -> dict:
         3. Review suggested preference updates
         4. Apply updates with prepwise_update_preference
     """
+    from prepwise.tools import meal_history
+
+    if recipes_json is not None:
+        try:
+            recipes = _RECIPES_ADAPTER.validate_json(recipes_json)
+        except ValidationError as e:
+            return {"error": f"Invalid recipes_json: {e}"}
+    elif recipes is None:
+        return {"error": "Provide either recipes or recipes_json"}
+
     try:
         analysis = meal_history.analyze_recipes(recipes)
         summary = meal_history.format_analysis_summary(analysis)
@@ -445,8 +591,18 @@ def get_preferences_resource() -> str:
 
     This provides read-only access to preferences.
     """
+    global _rendered_cache
     prefs = pref_tools.load_preferences()
+    cached = _rendered_cache
+    if cached is not None and cached[0] is prefs and cached[1] == _prefs_version:
+        return cached[2]
+    rendered = _render_preferences_markdown(prefs)
+    _rendered_cache = (prefs, _prefs_version, rendered)
+    return rendered
 
+
+def _render_preferences_markdown(prefs: PreferenceProfile) -> str:
+    """Render a preference profile as markdown for the preferences resource."""
     lines = [
         "# PrepWise User Preferences",
         "",
@@ -469,22 +625,24 @@ def get_preferences_resource() -> str:
 
     if prefs.ingredients:
         lines.append("## Ingredient Preferences")
-        for ing, rating in sorted(prefs.ingredients.items(), key=lambda x: -x[1]):
-            emoji = {2: "love", 1: "like", -1: "dislike", -2: "hate"}.get(rating, "neutral")
+        for ing, rating in sorted(prefs.ingredients.items(), key=itemgetter(1), reverse=True):
+            emoji = _rating_label(rating)
             lines.append(f"- {ing}: {emoji} ({rating:+d})")
         lines.append("")
 
     if prefs.cuisines:
         lines.append("## Cuisine Preferences")
-        for cuisine, rating in sorted(prefs.cuisines.items(), key=lambda x: -x[1]):
-            emoji = {2: "love", 1: "like", -1: "dislike", -2: "hate"}.get(rating, "neutral")
+        for cuisine, rating in sorted(prefs.cuisines.items(), key=itemgetter(1), reverse=True):
+            emoji = _rating_label(rating)
             lines.append(f"- {cuisine}: {emoji} ({rating:+d})")
         lines.append("")
 
     if prefs.cooking_methods:
         lines.append("## Cooking Method Preferences")
-        for method, rating in sorted(prefs.cooking_methods.items(), key=lambda x: -x[1]):
-            emoji = {2: "love", 1: "like", -1: "dislike", -2: "hate"}.get(rating, "neutral")
+        for method, rating in sorted(
+            prefs.cooking_methods.items(), key=itemgetter(1), reverse=True
+        ):
+            emoji = _rating_label(rating)
             lines.append(f"- {method}: {emoji} ({rating:+d})")
 
     return "\n".join(lines)
@@ -495,6 +653,21 @@ def get_preferences_resource() -> str:
 # ============================================================================
 
 
+def _warm_tool_schemas() -> None:
+    """
+    Resolve every tool's schemas before the stdio loop starts.
+
+    FastMCP builds input schemas when a tool is registered, but output
+    schemas are cached properties that are computed on the first
+    tools/list request.
+    """
+    for tool in mcp._tool_manager.list_tools():
+        _ = tool.output_schema
+
+
+_warm_tool_schemas()
+
+
 def main():
     """Run the PrepWise MCP server."""
     mcp.run(transport="stdio")
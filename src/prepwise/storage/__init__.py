@@ -2,5 +2,6 @@
 
 from prepwise.storage.paths import PREPWISE_DIR, ensure_data_dir
 from prepwise.storage.json_store import JSONStore
+from prepwise.storage.journal import JSONJournal
 
-__all__ = ["PREPWISE_DIR", "ensure_data_dir", "JSONStore"]
+__all__ = ["PREPWISE_DIR", "ensure_data_dir", "JSONStore", "JSONJournal"]
@@ -0,0 +1,81 @@
+"""Append-only JSON Lines journal for incremental saves."""
+
+import logging
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from prepwise.storage.paths import ensure_data_dir
+
+logger = logging.getLogger(__name__)
+
+
+class JSONJournal:
+    """
+    Append-only log of JSON records, one per line.
+
+    Small frequent edits are appended here instead of rewriting a whole JSON file; the owner
+    replays the records onto the last full snapshot and compacts the journal once it grows.
+    """
+
+    def __init__(self, file_path: Path):
+        """
+        Initialize a journal.
+
+        Args:
+            file_path: Path to the journal file
+        """
+        self.file_path = file_path
+
+    def append(self, records: Iterable[dict[str, Any]]) -> None:
+        """Append records and fsync, so a save costs one short write instead of a rewrite."""
+        ensure_data_dir()
+
+        buf = b"".join(orjson.dumps(record) + b"\n" for record in records)
+        with open(self.file_path, "a+b") as f:
+            # A save interrupted mid-write leaves a torn last line; start on a fresh one
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    buf = b"\n" + buf
+            f.write(buf)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def read(self) -> list[dict[str, Any]]:
+        """Read all records in order, skipping any line that isn't valid JSON."""
+        try:
+            with open(self.file_path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return []
+
+        records = []
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                logger.warning(f"Skipping unreadable record in {self.file_path}: {line[:80]!r}")
+        return records
+
+    def size(self) -> int:
+        """Size of the journal in bytes (0 if it doesn't exist)."""
+        try:
+            return os.stat(self.file_path).st_size
+        except FileNotFoundError:
+            return 0
+
+    def archive(self, suffix: str) -> Path:
+        """Move the journal aside (replacing an earlier archive) and return its new path."""
+        target = self.file_path.with_name(self.file_path.name + suffix)
+        os.replace(self.file_path, target)
+        return target
+
+    def clear(self) -> None:
+        """Remove the journal, after its records have been folded into a snapshot."""
+        self.file_path.unlink(missing_ok=True)
@@ -1,19 +1,38 @@
 """Generic JSON file storage utility."""
 
-import json
+import hashlib
+import logging
+import os
 from pathlib import Path
 from typing import Any, TypeVar, Generic
-from pydantic import BaseModel
+
+from pydantic import BaseModel, ValidationError
 
 from prepwise.storage.paths import ensure_data_dir
 
+logger = logging.getLogger(__name__)
+
 T = TypeVar("T", bound=BaseModel)
 
+# Parsed models keyed by file path, tagged with the file's mtime when they were cached and
+# the digest of the bytes they were loaded from or saved as
+_CACHE: dict[Path, tuple[int, BaseModel, bytes]] = {}
+
+
+def _digest(buf: bytes) -> bytes:
+    """Short fingerprint of a serialized payload for change detection."""
+    return hashlib.blake2b(buf, digest_size=8).digest()
+
 
 class JSONStore(Generic[T]):
     """Generic JSON file storage for Pydantic models."""
 
-    def __init__(self, file_path: Path, model_class: type[T], default_factory: Any = None):
+    def __init__(
+        self,
+        file_path: Path,
+        model_class: type[T],
+        default_factory: Any = None,
+    ):
         """
         Initialize a JSON store.
 
@@ -27,33 +46,113 @@ class JSONStore(Generic[T]):
         self.default_factory = default_factory or model_class
 
     def load(self) -> T:
-        """Load data from the JSON file, creating default if not exists."""
+        """
+        Load data from the JSON file, creating default if not exists.
+
+        Repeated loads of an unchanged file return the same cached instance, so callers
+        that mutate the result should save it back.
+        """
         ensure_data_dir()
 
-        if not self.file_path.exists():
+        try:
+            mtime_ns = os.stat(self.file_path).st_mtime_ns
+        except FileNotFoundError:
             return self.default_factory()
 
+        cached = _CACHE.get(self.file_path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
         try:
-            with open(self.file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return self.model_class.model_validate(data)
-        except (json.JSONDecodeError, Exception):
-            # If file is corrupted, return default
+            with open(self.file_path, "rb") as f:
+                raw = f.read()
+            # Parse and validate in one pydantic-core pass, without a dict in between
+            model = self.model_class.model_validate_json(raw)
+        except (FileNotFoundError, ValidationError) as e:
+            # If file is missing or corrupted, return default
+            logger.warning(f"Corrupt or missing {self.file_path}, using defaults: {e}")
             return self.default_factory()
 
+        _CACHE[self.file_path] = (mtime_ns, model, _digest(raw))
+        return model
+
+    def digest(self) -> str | None:
+        """
+        Fingerprint of the file's current contents, or None if it doesn't exist.
+
+        Lets companion files (such as a journal of later edits) record which version of
+        the file they were written against.
+        """
+        try:
+            mtime_ns = os.stat(self.file_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        cached = _CACHE.get(self.file_path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[2].hex()
+        with open(self.file_path, "rb") as f:
+            return _digest(f.read()).hex()
+
     def save(self, data: T) -> None:
-        """Save data to the JSON file."""
+        """
+        Save data to the JSON file.
+
+        The payload is written to a temporary file, fsynced and renamed over the target so an
+        interrupted save never leaves a truncated file. Saves that would write the bytes the
+        file already holds (as last loaded or saved) are skipped.
+        """
+        # pydantic-core serializes straight to JSON, datetimes included
+        self.save_bytes(data.model_dump_json(indent=2).encode("utf-8"), data)
+
+    def save_bytes(self, buf: bytes, data: T) -> None:
+        """
+        Save an already-serialized payload, with the same guarantees as save().
+
+        If the write fails, the cached model is dropped so later loads re-read the file.
+
+        Args:
+            buf: JSON encoding of data, for callers with their own serializer
+            data: The model buf was produced from, cached for later loads
+        """
         ensure_data_dir()
 
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            json.dump(data.model_dump(), f, indent=2, default=str)
+        digest = _digest(buf)
+
+        cached = _CACHE.get(self.file_path)
+        if cached is not None and cached[2] == digest:
+            try:
+                if os.stat(self.file_path).st_mtime_ns == cached[0]:
+                    return
+            except FileNotFoundError:
+                pass
+
+        tmp_path = self.file_path.with_suffix(".json.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(buf)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            # Callers mutate the cached instance before saving; forget it so the next load
+            # returns what is actually on disk rather than the unsaved change
+            self.invalidate()
+            tmp_path.unlink(missing_ok=True)
+            raise
+        _CACHE[self.file_path] = (os.stat(self.file_path).st_mtime_ns, data, digest)
 
     def exists(self) -> bool:
         """Check if the storage file exists."""
         return self.file_path.exists()
 
+    def invalidate(self) -> None:
+        """Forget the cached model so the next load re-reads the file."""
+        _CACHE.pop(self.file_path, None)
+
     def delete(self) -> bool:
         """Delete the storage file if it exists. Returns True if deleted."""
+        self.invalidate()
         if self.file_path.exists():
             self.file_path.unlink()
             return True
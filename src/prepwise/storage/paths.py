@@ -7,6 +7,8 @@ PREPWISE_DIR = Path.home() / ".prepwise"
 
 # File paths
 PREFERENCES_FILE = PREPWISE_DIR / "preferences.json"
+# Edits since the last full preferences snapshot, one JSON record per line
+PREFERENCES_JOURNAL_FILE = PREPWISE_DIR / "preferences.json.log"
 FAVORITE_SITES_FILE = PREPWISE_DIR / "favorite_sites.json"
 SETUP_COMPLETE_FILE = PREPWISE_DIR / "setup_complete"
 HEB_SESSION_DIR = PREPWISE_DIR / "heb_session"
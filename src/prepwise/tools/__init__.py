@@ -1,8 +1,12 @@
 """PrepWise MCP tools."""
 
-from prepwise.tools import preferences
-from prepwise.tools import favorite_sites
-from prepwise.tools import recipe_parser
-from prepwise.tools import heb_cart
+import importlib
 
-__all__ = ["preferences", "favorite_sites", "recipe_parser", "heb_cart"]
+__all__ = ["preferences", "favorite_sites", "recipe_parser", "heb_cart", "meal_history"]
+
+
+def __getattr__(name: str):
+    """Import tool submodules on first access (keeps Playwright etc. off the import path)."""
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,14 @@
 """Favorite recipe websites management for PrepWise."""
 
+from collections.abc import Mapping
 from datetime import datetime, timezone
+from functools import cached_property, lru_cache
+from typing import Any, Self
+from urllib.parse import urlsplit
+
 from pydantic import BaseModel, Field
 
+from prepwise.models.base import MODEL_CONFIG
 from prepwise.storage.json_store import JSONStore
 from prepwise.storage.paths import FAVORITE_SITES_FILE
 
@@ -10,6 +16,8 @@ from prepwise.storage.paths import FAVORITE_SITES_FILE
 class FavoriteSite(BaseModel):
     """A favorite recipe website."""
 
+    model_config = MODEL_CONFIG
+
     url: str = Field(description="Base URL of the site (e.g., https://www.budgetbytes.com)")
     name: str = Field(description="Display name for the site")
     added_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -18,46 +26,72 @@ class FavoriteSite(BaseModel):
 class FavoriteSites(BaseModel):
     """Collection of favorite recipe websites."""
 
+    model_config = MODEL_CONFIG
+
     sites: list[FavoriteSite] = Field(default_factory=list)
 
     def get_site_urls(self) -> list[str]:
         """Get list of site URLs for search queries."""
-        return [site.url for site in self.sites]
+        return list(self._url_tuple)
 
     def get_site_domains(self) -> list[str]:
         """Get list of site domains for site: search queries."""
-        domains = []
-        for site in self.sites:
-            # Extract domain from URL
-            url = site.url.replace("https://", "").replace("http://", "")
-            domain = url.split("/")[0]
-            domains.append(domain)
-        return domains
-
-
-# Default favorite sites to pre-populate
-DEFAULT_FAVORITE_SITES = [
-    FavoriteSite(
-        url="https://www.budgetbytes.com",
-        name="Budget Bytes",
-    ),
-    FavoriteSite(
-        url="https://www.allrecipes.com",
-        name="AllRecipes",
-    ),
-    FavoriteSite(
-        url="https://www.seriouseats.com",
-        name="Serious Eats",
-    ),
-]
+        return list(self._domain_tuple)
+
+    # Plain-string views of the sites, cached in the instance __dict__ (not model fields).
+    # Assigning sites or copying the model drops them; after mutating the list in place,
+    # call invalidate_lookups()
+
+    @cached_property
+    def _url_tuple(self) -> tuple[str, ...]:
+        return tuple(site.url for site in self.sites)
+
+    @cached_property
+    def _domain_tuple(self) -> tuple[str, ...]:
+        # Fall back to the first path segment for URLs stored without a scheme
+        return tuple(urlsplit(url).netloc or url.split("/", 1)[0] for url in self._url_tuple)
+
+    def invalidate_lookups(self) -> None:
+        """Drop the cached URL and domain tuples after the site list changes."""
+        self.__dict__.pop("_url_tuple", None)
+        self.__dict__.pop("_domain_tuple", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "sites":
+            self.invalidate_lookups()
 
+    def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> Self:
+        """Copy the collection without the source's cached lookups (update= may replace sites)."""
+        copied = super().model_copy(update=update, deep=deep)
+        copied.invalidate_lookups()
+        return copied
 
+
+# Default favorite sites to pre-populate, built into models only when first needed
+DEFAULT_FAVORITE_SITES: tuple[dict[str, str], ...] = (
+    {"url": "https://www.budgetbytes.com", "name": "Budget Bytes"},
+    {"url": "https://www.allrecipes.com", "name": "AllRecipes"},
+    {"url": "https://www.seriouseats.com", "name": "Serious Eats"},
+)
+
+
+@lru_cache(maxsize=1)
 def get_favorite_sites_store() -> JSONStore[FavoriteSites]:
-    """Get the favorite sites JSON store."""
+    """
+    Get the favorite sites JSON store.
+
+    The store is created once; it already caches the parsed file keyed by mtime, so
+    repeated load_favorite_sites() calls skip re-reading and re-validating.
+    """
+    # Schemas are deferred at import; this builds them on first use and is a no-op afterwards
+    FavoriteSites.model_rebuild()
     return JSONStore(
         FAVORITE_SITES_FILE,
         FavoriteSites,
-        default_factory=lambda: FavoriteSites(sites=DEFAULT_FAVORITE_SITES.copy()),
+        default_factory=lambda: FavoriteSites(
+            sites=[FavoriteSite(**site) for site in DEFAULT_FAVORITE_SITES]
+        ),
     )
 
 
@@ -92,13 +126,14 @@ def add_favorite_site(url: str, name: str) -> FavoriteSites:
         url = f"https://{url}"
 
     # Check if already exists
-    existing_urls = [s.url.lower() for s in sites.sites]
+    existing_urls = {site_url.lower() for site_url in sites.get_site_urls()}
     if url.lower() in existing_urls:
         return sites  # Already exists, no change
 
     # Add new site
     new_site = FavoriteSite(url=url, name=name.strip())
     sites.sites.append(new_site)
+    sites.invalidate_lookups()
 
     save_favorite_sites(sites)
     return sites
@@ -122,7 +157,11 @@ def remove_favorite_site(url: str) -> FavoriteSites:
         url_normalized = f"https://{url_normalized}"
 
     # Filter out the matching site
-    sites.sites = [s for s in sites.sites if s.url.lower() != url_normalized]
+    remaining = [s for s in sites.sites if s.url.lower() != url_normalized]
+    if len(remaining) == len(sites.sites):
+        return sites  # Not found, no change
+
+    sites.sites = remaining
 
     save_favorite_sites(sites)
     return sites
@@ -139,10 +178,10 @@ def get_search_site_queries(base_query: str) -> list[str]:
         List of queries with site: prefixes for each favorite site
     """
     sites = load_favorite_sites()
-    domains = sites.get_site_domains()
+    return list(_site_queries(base_query, tuple(sites.get_site_domains())))
 
-    queries = []
-    for domain in domains:
-        queries.append(f"site:{domain} {base_query}")
 
-    return queries
+@lru_cache(maxsize=128)
+def _site_queries(base_query: str, domains: tuple[str, ...]) -> tuple[str, ...]:
+    """Build site: queries, memoized on the query and the current domain list."""
+    return tuple(f"site:{domain} {base_query}" for domain in domains)
@@ -2,7 +2,11 @@
 
 import asyncio
 import logging
+import os
 import random
+import re
+from pathlib import Path
+from typing import Any
 from urllib.parse import quote
 
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
@@ -29,44 +33,192 @@ SELECTORS = {
     "logged_in_indicator": "[data-qe='account-menu']",
 }
 
+# Reads a product tile's title and price text in a single evaluate() call
+_TILE_DETAILS_JS = """el => {
+  const n = el.querySelector("[data-qe='product-title'], .product-title");
+  const p = el.querySelector("[data-qe='product-price'], .product-price");
+  return { name: n && n.textContent.trim(), price: p && p.textContent };
+}"""
+
+# Maximum number of ingredients searched in parallel tabs by add_items_to_cart
+CART_CONCURRENCY = 3
+
+# Ingredient cleanup patterns, compiled once for _clean_ingredient_for_search
+_UNITS = (
+    "cups?",
+    "tbsp?",
+    "tsp?",
+    "tablespoons?",
+    "teaspoons?",
+    "oz",
+    "ounces?",
+    "lbs?",
+    "pounds?",
+    "grams?",
+    "g",
+    "ml",
+    "liters?",
+    "quarts?",
+    "pints?",
+    "gallons?",
+    "cloves?",
+    "heads?",
+    "bunche?s?",
+    "cans?",
+    "jars?",
+    "packages?",
+    "bags?",
+    "boxes?",
+    "containers?",
+    "small",
+    "medium",
+    "large",
+    "extra-large",
+)
+_PREP_WORDS = (
+    "chopped",
+    "diced",
+    "minced",
+    "sliced",
+    "cubed",
+    "crushed",
+    "grated",
+    "shredded",
+    "melted",
+    "softened",
+    "fresh",
+    "frozen",
+    "canned",
+    "dried",
+    "ground",
+    "optional",
+    "to taste",
+    "for serving",
+    "divided",
+)
+_LEADING_QTY = re.compile(r"^\d+[\d./\s]*")
+_PARENS = re.compile(r"\([^)]*\)")
+_UNITS_RE = re.compile(r"\b(" + "|".join(_UNITS) + r")\b\.?", re.IGNORECASE)
+_PREP_RE = re.compile(r"\b(" + "|".join(_PREP_WORDS) + r")\b,?", re.IGNORECASE)
+_WS = re.compile(r"\s+")
+
+# Dollar amount in product price and cart total text
+_PRICE_RE = re.compile(r"\$?([\d.]+)")
+
+
+# Shared Playwright instance and persistent context: {"playwright", "context", "refcount"}
+_PW_LOCK = asyncio.Lock()
+_PW_STATE: dict[str, Any] | None = None
+
 
 async def get_browser_context(headless: bool = False) -> tuple[Browser, BrowserContext]:
     """
     Get or create a persistent browser context for HEB.
 
+    The context is shared across calls and reference counted; pair each call with
+    release_browser_context() unless the browser should stay open for the user. A context
+    that is already running is reused as-is, whatever its headless mode.
+
     Args:
         headless: Whether to run browser in headless mode (default False for visibility)
 
     Returns:
         Tuple of (browser, context)
     """
-    ensure_data_dir()
-    HEB_SESSION_DIR.mkdir(parents=True, exist_ok=True)
+    global _PW_STATE
+
+    async with _PW_LOCK:
+        if _PW_STATE is None:
+            ensure_data_dir()
+            HEB_SESSION_DIR.mkdir(parents=True, exist_ok=True)
+
+            playwright = await async_playwright().start()
+
+            # Use persistent context to maintain login state
+            context = await playwright.chromium.launch_persistent_context(
+                user_data_dir=str(HEB_SESSION_DIR),
+                headless=headless,
+                viewport={"width": 1280, "height": 800},
+                user_agent=(
+                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+                ),
+            )
+            # The user closing the browser window ends the shared context
+            context.on("close", _on_context_closed)
+            _PW_STATE = {"playwright": playwright, "context": context, "refcount": 0}
+
+        _PW_STATE["refcount"] += 1
+        return _PW_STATE["playwright"], _PW_STATE["context"]
+
+
+async def release_browser_context() -> None:
+    """Drop a reference from get_browser_context(), closing the browser on the last one."""
+    global _PW_STATE
+
+    async with _PW_LOCK:
+        state = _PW_STATE
+        if state is None:
+            return
+        state["refcount"] -= 1
+        if state["refcount"] > 0:
+            return
+        _PW_STATE = None
+
+    await _close_browser_state(state)
+
+
+async def shutdown_heb_browser() -> None:
+    """Close the shared browser regardless of outstanding references (for app exit)."""
+    global _PW_STATE
+
+    async with _PW_LOCK:
+        state, _PW_STATE = _PW_STATE, None
+
+    if state is not None:
+        await _close_browser_state(state)
+
+
+async def _close_browser_state(state: dict[str, Any]) -> None:
+    """Close a context and stop its Playwright driver, tolerating an already-closed browser."""
+    try:
+        await state["context"].close()
+    except Exception as e:
+        logger.debug(f"HEB browser context already closed: {e}")
+    await state["playwright"].stop()
 
-    playwright = await async_playwright().start()
 
-    # Use persistent context to maintain login state
-    context = await playwright.chromium.launch_persistent_context(
-        user_data_dir=str(HEB_SESSION_DIR),
-        headless=headless,
-        viewport={"width": 1280, "height": 800},
-        user_agent=(
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        ),
-    )
+async def _on_context_closed(context: BrowserContext) -> None:
+    """Forget the shared context once its browser has gone away."""
+    global _PW_STATE
 
-    return playwright, context
+    state = _PW_STATE
+    if state is not None and state["context"] is context:
+        _PW_STATE = None
+        await state["playwright"].stop()
+
+
+def _dir_nonempty(path: Path) -> bool:
+    """Check whether a directory has any entries without listing all of them."""
+    try:
+        with os.scandir(path) as entries:
+            return next(entries, None) is not None
+    except FileNotFoundError:
+        return False
 
 
 async def check_session_status() -> HEBSessionStatus:
     """
     Check if there's an active HEB session.
 
+    The check runs in a tab of its own, closed afterwards. If the browser from
+    open_heb_login() is still open, that visible window is reused (so the tab shows up
+    there) and the user's login tab is left alone.
+
     Returns:
         HEBSessionStatus with login state information
     """
-    session_exists = HEB_SESSION_DIR.exists() and any(HEB_SESSION_DIR.iterdir())
+    session_exists = _dir_nonempty(HEB_SESSION_DIR)
 
     if not session_exists:
         return HEBSessionStatus(
@@ -78,8 +230,10 @@ async def check_session_status() -> HEBSessionStatus:
     # Try to check if actually logged in by visiting HEB
     try:
         playwright, context = await get_browser_context(headless=True)
+        page = None
         try:
-            page = context.pages[0] if context.pages else await context.new_page()
+            # Never take over an existing tab: it may be the one the user is logging in on
+            page = await context.new_page()
 
             # Go to HEB homepage
             await page.goto(HEB_BASE_URL, timeout=30000)
@@ -99,8 +253,12 @@ async def check_session_status() -> HEBSessionStatus:
                     message="Session exists but you may need to log in again.",
                 )
         finally:
-            await context.close()
-            await playwright.stop()
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception as e:
+                    logger.debug(f"HEB session check tab already closed: {e}")
+            await release_browser_context()
 
     except Exception as e:
         logger.warning(f"Error checking HEB session: {e}")
@@ -121,7 +279,9 @@ async def open_heb_login() -> str:
     playwright, context = await get_browser_context(headless=False)
 
     try:
-        page = context.pages[0] if context.pages else await context.new_page()
+        # A tab of its own: the shared context's existing tabs may belong to other calls
+        # (e.g. the cart review tab from add_items_to_cart)
+        page = await context.new_page()
 
         # Navigate to login page
         await page.goto(HEB_LOGIN_URL, timeout=30000)
@@ -132,8 +292,7 @@ async def open_heb_login() -> str:
             "Close the browser window when done, or leave it open to continue shopping."
         )
     except Exception as e:
-        await context.close()
-        await playwright.stop()
+        await release_browser_context()
         raise RuntimeError(f"Failed to open HEB login: {e}")
 
 
@@ -152,10 +311,30 @@ async def add_items_to_cart(ingredients: list[str]) -> HEBCartResult:
     playwright, context = await get_browser_context(headless=False)
 
     try:
-        page = context.pages[0] if context.pages else await context.new_page()
+        # A few tabs at once overlaps page loads without tripping anti-bot heuristics
+        sem = asyncio.Semaphore(CART_CONCURRENCY)
+
+        async def worker(ingredient: str) -> HEBCartItem:
+            async with sem:
+                tab = await context.new_page()
+                try:
+                    item = await _add_single_item(tab, ingredient)
+                finally:
+                    await tab.close()
+                # Human-like delay before this slot takes the next item
+                await asyncio.sleep(random.uniform(1.5, 3.0))
+                return item
+
+        outcomes = await asyncio.gather(
+            *(worker(ingredient) for ingredient in ingredients), return_exceptions=True
+        )
 
-        for ingredient in ingredients:
-            item_result = await _add_single_item(page, ingredient)
+        for ingredient, item_result in zip(ingredients, outcomes):
+            if isinstance(item_result, BaseException):
+                logger.warning(f"Error adding {ingredient}: {item_result}")
+                item_result = HEBCartItem.model_construct(
+                    search_term=ingredient, success=False, error=str(item_result)
+                )
             result.items.append(item_result)
 
             if item_result.success:
@@ -165,11 +344,10 @@ async def add_items_to_cart(ingredients: list[str]) -> HEBCartResult:
             else:
                 result.total_not_found += 1
 
-            # Human-like delay between items
-            await asyncio.sleep(random.uniform(1.5, 3.0))
-
-        # Try to get cart total
+        # Try to get cart total, in a tab of its own that stays open for the user to review;
+        # the shared context's first tab may be a login or session-check tab
         try:
+            page = await context.new_page()
             await page.goto(HEB_CART_URL, timeout=30000)
             await page.wait_for_load_state("networkidle", timeout=10000)
 
@@ -178,9 +356,7 @@ async def add_items_to_cart(ingredients: list[str]) -> HEBCartResult:
             if await total_element.count() > 0:
                 total_text = await total_element.text_content()
                 if total_text:
-                    import re
-
-                    match = re.search(r"\$?([\d.]+)", total_text)
+                    match = _PRICE_RE.search(total_text)
                     if match:
                         result.cart_total = float(match.group(1))
         except Exception as e:
@@ -206,6 +382,9 @@ async def _add_single_item(page: Page, ingredient: str) -> HEBCartItem:
 
     Returns:
         HEBCartItem with result
+
+    Items are built with model_construct since every field comes from this
+    function with the right type already.
     """
     # Clean up ingredient for search
     search_term = _clean_ingredient_for_search(ingredient)
@@ -220,7 +399,7 @@ async def _add_single_item(page: Page, ingredient: str) -> HEBCartItem:
             await page.wait_for_selector(SELECTORS["product_tile"], timeout=10000)
         except Exception:
             # No products found
-            return HEBCartItem(
+            return HEBCartItem.model_construct(
                 search_term=ingredient,
                 success=False,
                 suggestion=_get_search_suggestion(ingredient),
@@ -230,7 +409,7 @@ async def _add_single_item(page: Page, ingredient: str) -> HEBCartItem:
         add_btn = page.locator(SELECTORS["add_to_cart_btn"]).first
 
         if await add_btn.count() == 0:
-            return HEBCartItem(
+            return HEBCartItem.model_construct(
                 search_term=ingredient,
                 success=False,
                 suggestion=_get_search_suggestion(ingredient),
@@ -242,20 +421,14 @@ async def _add_single_item(page: Page, ingredient: str) -> HEBCartItem:
         price = None
 
         try:
-            name_elem = product_tile.locator("[data-qe='product-title'], .product-title").first
-            if await name_elem.count() > 0:
-                product_name = await name_elem.text_content()
-                product_name = product_name.strip() if product_name else None
-
-            price_elem = product_tile.locator("[data-qe='product-price'], .product-price").first
-            if await price_elem.count() > 0:
-                price_text = await price_elem.text_content()
-                if price_text:
-                    import re
-
-                    match = re.search(r"\$?([\d.]+)", price_text)
-                    if match:
-                        price = float(match.group(1))
+            # One round-trip for both fields instead of count() + text_content() per field
+            details = await product_tile.evaluate(_TILE_DETAILS_JS)
+            product_name = details["name"] or None
+            price_text = details["price"]
+            if price_text:
+                match = _PRICE_RE.search(price_text)
+                if match:
+                    price = float(match.group(1))
         except Exception:
             pass
 
@@ -265,7 +438,7 @@ async def _add_single_item(page: Page, ingredient: str) -> HEBCartItem:
         # Wait a moment for cart to update
         await asyncio.sleep(1.0)
 
-        return HEBCartItem(
+        return HEBCartItem.model_construct(
             search_term=ingredient,
             product_name=product_name,
             price=price,
@@ -274,7 +447,7 @@ async def _add_single_item(page: Page, ingredient: str) -> HEBCartItem:
 
     except Exception as e:
         logger.warning(f"Error adding {ingredient}: {e}")
-        return HEBCartItem(
+        return HEBCartItem.model_construct(
             search_term=ingredient,
             success=False,
             error=str(e),
@@ -287,77 +460,18 @@ def _clean_ingredient_for_search(ingredient: str) -> str:
 
     Removes quantities, units, and prep instructions to get core ingredient.
     """
-    import re
-
     # Remove common quantity patterns
-    ingredient = re.sub(r"^\d+[\d./\s]*", "", ingredient)  # Leading numbers
-    ingredient = re.sub(r"\([^)]*\)", "", ingredient)  # Parenthetical notes
+    ingredient = _LEADING_QTY.sub("", ingredient)  # Leading numbers
+    ingredient = _PARENS.sub("", ingredient)  # Parenthetical notes
 
     # Remove common units
-    units = [
-        "cups?",
-        "tbsp?",
-        "tsp?",
-        "tablespoons?",
-        "teaspoons?",
-        "oz",
-        "ounces?",
-        "lbs?",
-        "pounds?",
-        "grams?",
-        "g",
-        "ml",
-        "liters?",
-        "quarts?",
-        "pints?",
-        "gallons?",
-        "cloves?",
-        "heads?",
-        "bunche?s?",
-        "cans?",
-        "jars?",
-        "packages?",
-        "bags?",
-        "boxes?",
-        "containers?",
-        "small",
-        "medium",
-        "large",
-        "extra-large",
-    ]
-    units_pattern = r"\b(" + "|".join(units) + r")\b\.?"
-    ingredient = re.sub(units_pattern, "", ingredient, flags=re.IGNORECASE)
+    ingredient = _UNITS_RE.sub("", ingredient)
 
     # Remove prep instructions
-    prep_words = [
-        "chopped",
-        "diced",
-        "minced",
-        "sliced",
-        "cubed",
-        "crushed",
-        "grated",
-        "shredded",
-        "melted",
-        "softened",
-        "fresh",
-        "frozen",
-        "canned",
-        "dried",
-        "ground",
-        "optional",
-        "to taste",
-        "for serving",
-        "divided",
-    ]
-    for word in prep_words:
-        ingredient = re.sub(rf"\b{word}\b,?", "", ingredient, flags=re.IGNORECASE)
+    ingredient = _PREP_RE.sub("", ingredient)
 
     # Clean up whitespace and punctuation
-    ingredient = re.sub(r"\s+", " ", ingredient)
-    ingredient = ingredient.strip(" ,.-")
-
-    return ingredient
+    return _WS.sub(" ", ingredient).strip(" ,.-")
 
 
 def _get_search_suggestion(ingredient: str) -> str:
@@ -1,15 +1,19 @@
 """Meal history analysis tools for learning preferences from past meals."""
 
+import json
 from collections import Counter
+from collections.abc import Iterator
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import TextIO
 
 
 @dataclass
 class MealHistoryAnalysis:
     """Results from analyzing meal history."""
 
-    # Counts by category
-    cuisine_counts: dict[str, int]
+    # Counts by category (cuisines keep the Counter for most_common() ordering)
+    cuisine_counts: Counter[str]
     meal_type_counts: dict[str, int]
     difficulty_counts: dict[str, int]
     rating_distribution: dict[str, int]
@@ -26,6 +30,44 @@ class MealHistoryAnalysis:
     suggested_updates: list[dict]
 
 
+# All known cuisines for detecting avoided ones
+_ALL_CUISINES: frozenset[str] = frozenset(
+    {
+        "Mexican",
+        "Italian",
+        "Chinese",
+        "Japanese",
+        "Indian",
+        "Thai",
+        "Mediterranean",
+        "American",
+        "Korean",
+        "Vietnamese",
+        "Middle Eastern",
+        "Greek",
+        "French",
+    }
+)
+
+# Cooking methods suggested for each preferred difficulty, as (method, rating) pairs
+_DIFFICULTY_METHODS: dict[str, tuple[tuple[str, int], ...]] = {
+    "Easy": (("one_pot", 1), ("sheet_pan", 1), ("slow_cooker", 1)),
+    "Medium": (("air_fryer", 1), ("instant_pot", 1)),
+    "Hard": (("sous_vide", 1), ("smoking", 1)),
+}
+
+
+@lru_cache(maxsize=512)
+def _parse_list_field(value: str) -> tuple[str, ...]:
+    """Parse a Cuisine/Type string that is either a JSON list or a single bare value."""
+    if value.startswith("["):
+        try:
+            return tuple(json.loads(value))
+        except json.JSONDecodeError:
+            pass
+    return (value,) if value else ()
+
+
 def analyze_recipes(recipes: list[dict]) -> MealHistoryAnalysis:
     """
     Analyze a list of recipes from the user's recipe database.
@@ -43,73 +85,52 @@ def analyze_recipes(recipes: list[dict]) -> MealHistoryAnalysis:
     Returns:
         MealHistoryAnalysis with counts, insights, and suggested preference updates
     """
-    import json
-
     cuisine_counter: Counter[str] = Counter()
     meal_type_counter: Counter[str] = Counter()
-    difficulty_counter: Counter[str] = Counter()
-    rating_counter: Counter[str] = Counter()
-    prep_times: list[float] = []
-    cook_times: list[float] = []
-
-    # All known cuisines for detecting avoided ones
-    all_cuisines = {
-        "Mexican",
-        "Italian",
-        "Chinese",
-        "Japanese",
-        "Indian",
-        "Thai",
-        "Mediterranean",
-        "American",
-        "Korean",
-        "Vietnamese",
-        "Middle Eastern",
-        "Greek",
-        "French",
-    }
+    difficulties: list[str] = []
+    ratings: list[str] = []
+    prep_sum = 0.0
+    prep_n = 0
+    cook_sum = 0.0
+    cook_n = 0
 
     for recipe in recipes:
         # Parse cuisines (could be list or JSON string)
-        cuisines = recipe.get("Cuisine", [])
-        if isinstance(cuisines, str):
-            try:
-                cuisines = json.loads(cuisines)
-            except json.JSONDecodeError:
-                cuisines = [cuisines] if cuisines else []
-
-        for cuisine in cuisines:
-            cuisine_counter[cuisine] += 1
+        cuisines = recipe.get("Cuisine")
+        cuisine_counter.update(
+            _parse_list_field(cuisines) if isinstance(cuisines, str) else cuisines or ()
+        )
 
         # Parse meal types
-        meal_types = recipe.get("Type", [])
-        if isinstance(meal_types, str):
-            try:
-                meal_types = json.loads(meal_types)
-            except json.JSONDecodeError:
-                meal_types = [meal_types] if meal_types else []
-
-        for meal_type in meal_types:
-            meal_type_counter[meal_type] += 1
+        meal_types = recipe.get("Type")
+        meal_type_counter.update(
+            _parse_list_field(meal_types) if isinstance(meal_types, str) else meal_types or ()
+        )
 
         # Difficulty
         difficulty = recipe.get("Difficulty")
         if difficulty:
-            difficulty_counter[difficulty] += 1
+            difficulties.append(difficulty)
 
         # Rating
         rating = recipe.get("Rating")
         if rating:
-            rating_counter[str(rating)] += 1
+            ratings.append(str(rating))
 
         # Timing
         prep_time = recipe.get("Prep Time")
         if prep_time is not None:
-            prep_times.append(float(prep_time))
+            prep_sum += float(prep_time)
+            prep_n += 1
 
         cook_time = recipe.get("Cook Time")
         if cook_time is not None:
-            cook_times.append(float(cook_time))
+            cook_sum += float(cook_time)
+            cook_n += 1
+
+    # Count difficulties and ratings in one C-level pass each
+    difficulty_counter = Counter(difficulties)
+    rating_counter = Counter(ratings)
 
     # Derive insights
     total_recipes = len(recipes)
@@ -120,10 +141,7 @@ def analyze_recipes(recipes: list[dict]) -> MealHistoryAnalysis:
     ][:3]
 
     # Avoided cuisines (known cuisines with 0 usage when user has 5+ recipes)
-    used_cuisines = set(cuisine_counter.keys())
-    avoided_cuisines = []
-    if total_recipes >= 5:
-        avoided_cuisines = list(all_cuisines - used_cuisines)
+    avoided_cuisines = list(_ALL_CUISINES.difference(cuisine_counter)) if total_recipes >= 5 else []
 
     # Preferred difficulty
     preferred_difficulty = None
@@ -131,8 +149,8 @@ def analyze_recipes(recipes: list[dict]) -> MealHistoryAnalysis:
         preferred_difficulty = difficulty_counter.most_common(1)[0][0]
 
     # Average times
-    average_prep_time = sum(prep_times) / len(prep_times) if prep_times else None
-    average_cook_time = sum(cook_times) / len(cook_times) if cook_times else None
+    average_prep_time = prep_sum / prep_n if prep_n else None
+    average_cook_time = cook_sum / cook_n if cook_n else None
 
     # Generate suggested preference updates
     suggested_updates = _generate_suggestions(
@@ -147,7 +165,7 @@ def analyze_recipes(recipes: list[dict]) -> MealHistoryAnalysis:
     )
 
     return MealHistoryAnalysis(
-        cuisine_counts=dict(cuisine_counter),
+        cuisine_counts=cuisine_counter,
         meal_type_counts=dict(meal_type_counter),
         difficulty_counts=dict(difficulty_counter),
         rating_distribution=dict(rating_counter),
@@ -181,18 +199,22 @@ def _generate_suggestions(
     # Suggest liking frequently used cuisines
     for cuisine in favorite_cuisines:
         count = cuisine_counter.get(cuisine, 0)
+        # Compare shares with integer cross-multiplication; most cuisines stop here
+        share = count * 100
+        if share <= 15 * total_recipes:
+            continue
         # Strong preference if used in >30% of recipes
-        if count / total_recipes > 0.3:
+        if share > 30 * total_recipes:
             suggestions.append(
                 {
                     "category": "cuisine",
                     "item": cuisine,
                     "suggested_rating": 2,
-                    "reason": f"You've made {count} {cuisine} recipes ({count * 100 // total_recipes}% of your collection)",
+                    "reason": f"You've made {count} {cuisine} recipes ({share // total_recipes}% of your collection)",
                     "confidence": "high",
                 }
             )
-        elif count / total_recipes > 0.15:
+        else:
             suggestions.append(
                 {
                     "category": "cuisine",
@@ -205,12 +227,7 @@ def _generate_suggestions(
 
     # Suggest cooking method preferences based on difficulty
     if preferred_difficulty:
-        method_map = {
-            "Easy": [("one_pot", 1), ("sheet_pan", 1), ("slow_cooker", 1)],
-            "Medium": [("air_fryer", 1), ("instant_pot", 1)],
-            "Hard": [("sous_vide", 1), ("smoking", 1)],
-        }
-        for method, rating in method_map.get(preferred_difficulty, []):
+        for method, rating in _DIFFICULTY_METHODS.get(preferred_difficulty, ()):
             suggestions.append(
                 {
                     "category": "cooking_method",
@@ -229,53 +246,68 @@ def _generate_suggestions(
 
 def format_analysis_summary(analysis: MealHistoryAnalysis) -> str:
     """Format the analysis as a human-readable summary."""
-    lines = [
-        f"## Meal History Analysis",
-        f"",
-        f"**Total Recipes:** {analysis.total_recipes}",
-        f"",
-    ]
+    return "\n".join(_iter_summary_lines(analysis))
+
+
+def write_analysis_summary(analysis: MealHistoryAnalysis, fileobj: TextIO) -> None:
+    """
+    Write the formatted summary straight to a text file object.
+
+    Lines are streamed through writelines() without building the joined string first, so
+    a file opened with a large buffer (e.g. ``buffering=1 << 20``) sees a single flush.
+
+    Args:
+        analysis: Analysis to format
+        fileobj: Writable text file object
+    """
+    fileobj.writelines(f"{line}\n" for line in _iter_summary_lines(analysis))
+
+
+def _iter_summary_lines(analysis: MealHistoryAnalysis) -> Iterator[str]:
+    """Yield the lines of the human-readable summary."""
+    yield "## Meal History Analysis"
+    yield ""
+    yield f"**Total Recipes:** {analysis.total_recipes}"
+    yield ""
 
     if analysis.favorite_cuisines:
-        lines.append(f"**Favorite Cuisines:** {', '.join(analysis.favorite_cuisines)}")
+        yield f"**Favorite Cuisines:** {', '.join(analysis.favorite_cuisines)}"
 
     if analysis.preferred_difficulty:
-        lines.append(f"**Preferred Difficulty:** {analysis.preferred_difficulty}")
+        yield f"**Preferred Difficulty:** {analysis.preferred_difficulty}"
 
     if analysis.average_prep_time:
-        lines.append(f"**Average Prep Time:** {analysis.average_prep_time} minutes")
+        yield f"**Average Prep Time:** {analysis.average_prep_time} minutes"
 
     if analysis.average_cook_time:
-        lines.append(f"**Average Cook Time:** {analysis.average_cook_time} minutes")
+        yield f"**Average Cook Time:** {analysis.average_cook_time} minutes"
 
-    lines.append("")
+    yield ""
 
     if analysis.cuisine_counts:
-        lines.append("### Cuisine Breakdown")
-        for cuisine, count in sorted(analysis.cuisine_counts.items(), key=lambda x: -x[1]):
-            lines.append(f"- {cuisine}: {count}")
-        lines.append("")
+        yield "### Cuisine Breakdown"
+        for cuisine, count in analysis.cuisine_counts.most_common():
+            yield f"- {cuisine}: {count}"
+        yield ""
 
     if analysis.rating_distribution:
-        lines.append("### Rating Distribution")
-        for rating in ["5", "4", "3", "2", "1"]:
+        yield "### Rating Distribution"
+        for rating in ("5", "4", "3", "2", "1"):
             count = analysis.rating_distribution.get(rating, 0)
             if count > 0:
                 stars = "*" * int(rating)
-                lines.append(f"- {stars} ({rating}): {count} recipes")
-        lines.append("")
+                yield f"- {stars} ({rating}): {count} recipes"
+        yield ""
 
     if analysis.suggested_updates:
-        lines.append("### Suggested Preference Updates")
+        yield "### Suggested Preference Updates"
         for suggestion in analysis.suggested_updates:
             rating_text = {2: "love", 1: "like", -1: "dislike", -2: "hate"}.get(
                 suggestion["suggested_rating"], "neutral"
             )
-            lines.append(
+            yield (
                 f"- Set **{suggestion['item']}** ({suggestion['category']}) to `{rating_text}` "
                 f"({suggestion['confidence']} confidence)"
             )
-            lines.append(f"  - Reason: {suggestion['reason']}")
-        lines.append("")
-
-    return "\n".join(lines)
+            yield f"  - Reason: {suggestion['reason']}"
+        yield ""
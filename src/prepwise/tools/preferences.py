@@ -1,5 +1,17 @@
 """Preference management tools for PrepWise."""
 
+import bisect
+import logging
+import sys
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any
+
+import orjson
+from pydantic import ValidationError
+
 from prepwise.models.preferences import (
     PreferenceProfile,
     MacroTargets,
@@ -8,25 +20,215 @@ from prepwise.models.preferences import (
     COMMON_COOKING_METHODS,
     DIETARY_OPTIONS,
 )
+from prepwise.storage.journal import JSONJournal
 from prepwise.storage.json_store import JSONStore
-from prepwise.storage.paths import PREFERENCES_FILE, mark_setup_complete, is_setup_complete
+from prepwise.storage.paths import (
+    PREFERENCES_FILE,
+    PREFERENCES_JOURNAL_FILE,
+    mark_setup_complete,
+    is_setup_complete,
+)
+
+logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
 def get_preferences_store() -> JSONStore[PreferenceProfile]:
-    """Get the preferences JSON store."""
+    """
+    Get the preferences JSON store.
+
+    The store is created once and caches the parsed profile keyed by the file's mtime,
+    so successive mutators reuse one validated instance instead of re-reading the file.
+    """
     return JSONStore(PREFERENCES_FILE, PreferenceProfile)
 
 
+@lru_cache(maxsize=1)
+def get_preferences_journal() -> JSONJournal:
+    """Get the journal of preference edits made since the last full snapshot."""
+    return JSONJournal(PREFERENCES_JOURNAL_FILE)
+
+
+# Fold the journal into a fresh snapshot once it grows past this size
+JOURNAL_COMPACT_BYTES = 4096
+
+# Rating dicts journaled key by key, by the category name used in the records
+_JOURNAL_CATEGORIES = {
+    "ingredient": "ingredients",
+    "cuisine": "cuisines",
+    "cooking_method": "cooking_methods",
+}
+
+# The profile instance the journal was replayed onto, and its contents as persisted
+# (snapshot plus journal), which the next save diffs against
+_JOURNAL_STATE: dict[str, Any] = {"profile": None, "persisted": None}
+
+
+def _diff_records(old: dict[str, Any], new: dict[str, Any]) -> list[dict[str, Any]]:
+    """Journal records that turn the persisted profile dump old into new."""
+    records = []
+    for cat, field in _JOURNAL_CATEGORIES.items():
+        old_ratings, new_ratings = old[field], new[field]
+        for key, val in new_ratings.items():
+            if old_ratings.get(key) != val:
+                records.append({"op": "set", "cat": cat, "key": key, "val": val})
+        for key in old_ratings.keys() - new_ratings.keys():
+            records.append({"op": "del", "cat": cat, "key": key})
+    for field, val in new.items():
+        if field not in _JOURNAL_CATEGORIES.values() and old.get(field) != val:
+            records.append({"op": "field", "key": field, "val": val})
+    return records
+
+
+def _apply_record(prefs: PreferenceProfile, record: Any) -> None:
+    """Replay one journal record onto a profile in place, raising ValueError if it's invalid."""
+    if not isinstance(record, dict):
+        raise ValueError("record is not an object")
+    op = record.get("op")
+    if op in ("set", "del"):
+        ratings = getattr(prefs, _JOURNAL_CATEGORIES[record["cat"]])
+        key = record["key"]
+        if not isinstance(key, str):
+            raise ValueError(f"key must be a string, got {key!r}")
+        if op == "del":
+            ratings.pop(key, None)
+            return
+        val = record["val"]
+        if type(val) is not int or not -2 <= val <= 2:
+            raise ValueError(f"rating must be an int from -2 to +2, got {val!r}")
+        ratings[key] = val
+    elif op == "field":
+        key = record["key"]
+        if key not in PreferenceProfile.model_fields:
+            raise ValueError(f"unknown field {key!r}")
+        # Validate through the model so nested values (macro targets) come back typed
+        setattr(prefs, key, getattr(PreferenceProfile.model_validate({key: record["val"]}), key))
+    else:
+        raise ValueError(f"Unknown journal op: {op}")
+
+
+def _journal_header() -> dict[str, Any]:
+    """First journal record: the digest of the snapshot the journal's edits apply to."""
+    return {"op": "base", "snapshot": get_preferences_store().digest()}
+
+
+def _replay_journal(prefs: PreferenceProfile) -> None:
+    """Apply the journal to a freshly loaded snapshot and compact it if it has grown."""
+    journal = get_preferences_journal()
+    records = journal.read()
+
+    if records and records[0] != _journal_header():
+        # The snapshot changed after the journal was written (a hand edit, another writer,
+        # or a compaction cut short), so its edits would overwrite newer values
+        kept = journal.archive(".stale")
+        logger.warning(
+            f"Preferences journal was written against an older {PREFERENCES_FILE.name}; "
+            f"ignoring it (kept at {kept})"
+        )
+        records = []
+
+    skipped = 0
+    for record in records[1:]:
+        try:
+            _apply_record(prefs, record)
+        except (AttributeError, KeyError, TypeError, ValueError, ValidationError) as e:
+            logger.warning(f"Skipping bad preferences journal record {record!r}: {e}")
+            skipped += 1
+
+    _JOURNAL_STATE["profile"] = prefs
+    _JOURNAL_STATE["persisted"] = prefs.model_dump()
+    if skipped:
+        # Fold in the good records now, keeping the original so the skipped ones can still
+        # be recovered by hand instead of vanishing at the next compaction
+        kept = journal.archive(".bad")
+        logger.warning(f"Kept the preferences journal with {skipped} bad record(s) at {kept}")
+        _compact(prefs)
+    elif journal.size() > JOURNAL_COMPACT_BYTES:
+        _compact(prefs)
+
+
+def _compact(prefs: PreferenceProfile) -> None:
+    """Write a full snapshot of prefs and drop the journal it supersedes."""
+    # Snapshot first: if we stop before the journal is gone, its header no longer matches
+    # the new snapshot, so the next load sets it aside instead of replaying it
+    get_preferences_store().save_bytes(_serialize(prefs), prefs)
+    get_preferences_journal().clear()
+    _JOURNAL_STATE["profile"] = prefs
+    _JOURNAL_STATE["persisted"] = prefs.model_dump()
+
+
+def compact_preferences() -> None:
+    """Fold any journaled edits into preferences.json, e.g. before the server exits."""
+    if get_preferences_journal().size() > 0:
+        _compact(load_preferences())
+
+
 def load_preferences() -> PreferenceProfile:
     """Load user preferences from storage."""
     store = get_preferences_store()
-    return store.load()
+    prefs = store.load()
+    if prefs is not _JOURNAL_STATE["profile"]:
+        _replay_journal(prefs)
+    return prefs
+
+
+def _serialize(prefs: PreferenceProfile) -> bytes:
+    """Encode a profile as indented JSON bytes with orjson."""
+    return orjson.dumps(prefs.model_dump(), option=orjson.OPT_INDENT_2)
 
 
 def save_preferences(prefs: PreferenceProfile) -> None:
-    """Save user preferences to storage."""
-    store = get_preferences_store()
-    store.save(prefs)
+    """
+    Save user preferences to storage.
+
+    Edits to the loaded profile are appended to the journal as per-key records, after a
+    header naming the snapshot they apply to; a full snapshot is written when the journal
+    outgrows JOURNAL_COMPACT_BYTES, or when prefs isn't the profile the snapshot on disk was
+    loaded into (a new or replaced profile).
+    """
+    if prefs is not _JOURNAL_STATE["profile"] or get_preferences_store().load() is not prefs:
+        _compact(prefs)
+        return
+
+    persisted = prefs.model_dump()
+    records = _diff_records(_JOURNAL_STATE["persisted"], persisted)
+    if not records:
+        return
+
+    journal = get_preferences_journal()
+    if journal.size() == 0:
+        records.insert(0, _journal_header())
+    try:
+        journal.append(records)
+    except BaseException:
+        # prefs is the store's cached instance and now holds edits that never reached disk;
+        # drop it so the next load starts again from the files
+        get_preferences_store().invalidate()
+        _JOURNAL_STATE.update(profile=None, persisted=None)
+        raise
+    _JOURNAL_STATE["persisted"] = persisted
+    if journal.size() > JOURNAL_COMPACT_BYTES:
+        _compact(prefs)
+
+
+@contextmanager
+def preferences_transaction() -> Iterator[PreferenceProfile]:
+    """
+    Load preferences for several in-memory edits and save them once on exit.
+
+    If the block raises, nothing is saved and the loaded copy is discarded so the
+    next load re-reads the file.
+
+    Yields:
+        The preference profile to mutate
+    """
+    prefs = load_preferences()
+    try:
+        yield prefs
+    except BaseException:
+        get_preferences_store().invalidate()
+        raise
+    save_preferences(prefs)
 
 
 def update_preference(category: str, item: str, rating: int) -> PreferenceProfile:
@@ -41,38 +243,61 @@ def update_preference(category: str, item: str, rating: int) -> PreferenceProfil
     Returns:
         Updated preference profile
     """
-    if rating < -2 or rating > 2:
-        raise ValueError("Rating must be between -2 and +2")
-
     prefs = load_preferences()
+    _apply_preference(prefs, category, item, rating)
+    save_preferences(prefs)
+    return prefs
+
+
+def _item_key(item: str) -> str:
+    """Normalize an ingredient or cooking method name (interned to share the COMMON_* keys)."""
+    return sys.intern(item.lower().strip().replace(" ", "_"))
+
 
-    # Normalize item name
-    item_key = item.lower().strip().replace(" ", "_")
-
-    if category == "ingredient":
-        if rating == 0:
-            prefs.ingredients.pop(item_key, None)
-        else:
-            prefs.ingredients[item_key] = rating
-    elif category == "cuisine":
-        # Keep cuisine names capitalized for display
-        item_display = item.strip().title()
-        if rating == 0:
-            prefs.cuisines.pop(item_display, None)
-        else:
-            prefs.cuisines[item_display] = rating
-    elif category == "cooking_method":
-        if rating == 0:
-            prefs.cooking_methods.pop(item_key, None)
-        else:
-            prefs.cooking_methods[item_key] = rating
+def _set_rating(ratings: dict[str, int], key: str, rating: int) -> None:
+    """Store a rating, or drop the entry when the rating is 0."""
+    if rating == 0:
+        ratings.pop(key, None)
     else:
+        ratings[key] = rating
+
+
+def _apply_ingredient(prefs: PreferenceProfile, item: str, rating: int) -> None:
+    """Rate an ingredient, keyed by its normalized name."""
+    _set_rating(prefs.ingredients, _item_key(item), rating)
+
+
+def _apply_cuisine(prefs: PreferenceProfile, item: str, rating: int) -> None:
+    """Rate a cuisine, keyed by its title-cased name."""
+    # Keep cuisine names capitalized for display
+    _set_rating(prefs.cuisines, sys.intern(item.strip().title()), rating)
+
+
+def _apply_cooking_method(prefs: PreferenceProfile, item: str, rating: int) -> None:
+    """Rate a cooking method, keyed by its normalized name."""
+    _set_rating(prefs.cooking_methods, _item_key(item), rating)
+
+
+# Category -> in-place mutation, each with its own key normalization baked in
+_CATEGORY_HANDLERS: dict[str, Callable[[PreferenceProfile, str, int], None]] = {
+    "ingredient": _apply_ingredient,
+    "cuisine": _apply_cuisine,
+    "cooking_method": _apply_cooking_method,
+}
+
+
+def _apply_preference(prefs: PreferenceProfile, category: str, item: str, rating: int) -> None:
+    """Apply one rating to a profile in memory, raising before any change if it's invalid."""
+    if rating < -2 or rating > 2:
+        raise ValueError("Rating must be between -2 and +2")
+
+    try:
+        handler = _CATEGORY_HANDLERS[category]
+    except KeyError:
         raise ValueError(
             f"Unknown category: {category}. Must be 'ingredient', 'cuisine', or 'cooking_method'"
-        )
-
-    save_preferences(prefs)
-    return prefs
+        ) from None
+    handler(prefs, item, rating)
 
 
 def update_macro_targets(
@@ -83,7 +308,19 @@ def update_macro_targets(
 ) -> PreferenceProfile:
     """Update macro targets."""
     prefs = load_preferences()
+    _apply_macro_targets(prefs, daily_calories, daily_protein_g, daily_carbs_g, daily_fat_g)
+    save_preferences(prefs)
+    return prefs
+
 
+def _apply_macro_targets(
+    prefs: PreferenceProfile,
+    daily_calories: int | None = None,
+    daily_protein_g: int | None = None,
+    daily_carbs_g: int | None = None,
+    daily_fat_g: int | None = None,
+) -> None:
+    """Set the given macro targets on a profile in memory."""
     if daily_calories is not None:
         prefs.macro_targets.daily_calories = daily_calories
     if daily_protein_g is not None:
@@ -93,17 +330,16 @@ def update_macro_targets(
     if daily_fat_g is not None:
         prefs.macro_targets.daily_fat_g = daily_fat_g
 
-    save_preferences(prefs)
-    return prefs
-
 
 def add_dietary_restriction(restriction: str) -> PreferenceProfile:
-    """Add a dietary restriction."""
+    """Add a dietary restriction, keeping the list sorted."""
     prefs = load_preferences()
     restriction_normalized = restriction.lower().strip()
 
-    if restriction_normalized not in prefs.dietary_restrictions:
-        prefs.dietary_restrictions.append(restriction_normalized)
+    restrictions = prefs.dietary_restrictions
+    idx = bisect.bisect_left(restrictions, restriction_normalized)
+    if idx == len(restrictions) or restrictions[idx] != restriction_normalized:
+        restrictions.insert(idx, restriction_normalized)
         save_preferences(prefs)
 
     return prefs
@@ -114,13 +350,81 @@ def remove_dietary_restriction(restriction: str) -> PreferenceProfile:
     prefs = load_preferences()
     restriction_normalized = restriction.lower().strip()
 
-    if restriction_normalized in prefs.dietary_restrictions:
-        prefs.dietary_restrictions.remove(restriction_normalized)
+    restrictions = prefs.dietary_restrictions
+    idx = bisect.bisect_left(restrictions, restriction_normalized)
+    if idx < len(restrictions) and restrictions[idx] == restriction_normalized:
+        restrictions.pop(idx)
         save_preferences(prefs)
 
     return prefs
 
 
+def update_dietary_restrictions(
+    add: list[str] | None = None,
+    remove: list[str] | None = None,
+) -> PreferenceProfile:
+    """
+    Add and remove dietary restrictions with a single load and save.
+
+    Args:
+        add: Restrictions to add
+        remove: Restrictions to remove (wins if a restriction is in both lists)
+
+    Returns:
+        Updated preference profile, with restrictions stored sorted
+    """
+    prefs = load_preferences()
+    if _apply_dietary_restrictions(prefs, add, remove):
+        save_preferences(prefs)
+    return prefs
+
+
+def _apply_dietary_restrictions(
+    prefs: PreferenceProfile,
+    add: Iterable[str] | None = None,
+    remove: Iterable[str] | None = None,
+) -> bool:
+    """Add and remove restrictions on a profile in memory. Returns True if anything changed."""
+    to_add = {r.lower().strip() for r in add or ()}
+    to_remove = {r.lower().strip() for r in remove or ()}
+    restrictions = sorted((set(prefs.dietary_restrictions) | to_add) - to_remove)
+
+    if restrictions == prefs.dietary_restrictions:
+        return False
+    prefs.dietary_restrictions = restrictions
+    return True
+
+
+def update_preferences_batch(
+    updates: Iterable[tuple[str, str, int]] = (),
+    macros: dict[str, int | None] | None = None,
+    dietary_add: Iterable[str] | None = None,
+    dietary_remove: Iterable[str] | None = None,
+) -> PreferenceProfile:
+    """
+    Apply many preference changes with a single load and save.
+
+    Uses the same normalization as update_preference, update_macro_targets and
+    update_dietary_restrictions. If any update is invalid, nothing is saved.
+
+    Args:
+        updates: (category, item, rating) triples, as for update_preference
+        macros: Keyword arguments for update_macro_targets
+        dietary_add: Restrictions to add
+        dietary_remove: Restrictions to remove
+
+    Returns:
+        Updated preference profile
+    """
+    with preferences_transaction() as prefs:
+        for category, item, rating in updates:
+            _apply_preference(prefs, category, item, rating)
+        if macros:
+            _apply_macro_targets(prefs, **macros)
+        _apply_dietary_restrictions(prefs, dietary_add, dietary_remove)
+    return prefs
+
+
 def complete_setup() -> PreferenceProfile:
     """Mark setup as complete."""
     prefs = load_preferences()
@@ -130,22 +434,28 @@ def complete_setup() -> PreferenceProfile:
     return prefs
 
 
-def get_setup_questions() -> dict:
+# Wizard payload, frozen once: the COMMON_* tables are tuples and the mapping is read-only
+_SETUP_QUESTIONS: Mapping[str, tuple] = MappingProxyType(
+    {
+        "ingredients": tuple(COMMON_INGREDIENT_QUESTIONS),
+        "cuisines": tuple(COMMON_CUISINES),
+        "cooking_methods": tuple(COMMON_COOKING_METHODS),
+        "dietary_options": tuple(DIETARY_OPTIONS),
+    }
+)
+
+
+def get_setup_questions() -> Mapping[str, tuple]:
     """
     Get the pre-populated setup questions for the wizard.
 
-    Returns a dict with:
-    - ingredients: list of (key, display_name) tuples
-    - cuisines: list of cuisine names
-    - cooking_methods: list of (key, display_name) tuples
-    - dietary_options: list of dietary restriction options
+    Returns a read-only mapping, shared between callers, with:
+    - ingredients: tuple of (key, display_name) pairs
+    - cuisines: tuple of cuisine names
+    - cooking_methods: tuple of (key, display_name) pairs
+    - dietary_options: tuple of dietary restriction options
     """
-    return {
-        "ingredients": COMMON_INGREDIENT_QUESTIONS,
-        "cuisines": COMMON_CUISINES,
-        "cooking_methods": COMMON_COOKING_METHODS,
-        "dietary_options": DIETARY_OPTIONS,
-    }
+    return _SETUP_QUESTIONS
 
 
 def needs_setup() -> bool:
@@ -1,16 +1,26 @@
 """Recipe URL parsing using recipe-scrapers library."""
 
-import logging
-from typing import Optional
-from urllib.parse import urlparse
-
-import httpx
-from recipe_scrapers import scrape_html
-from recipe_scrapers._exceptions import WebsiteNotImplementedError
+import asyncio
+import functools
+import math
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlsplit, urlunsplit
 
 from prepwise.models.recipe import Recipe, RecipeIngredient, RecipeNutrition
 
-logger = logging.getLogger(__name__)
+# httpx and recipe-scrapers (BeautifulSoup, extruct, ...) are imported where they're used,
+# so the estimators and other helpers here load without them
+if TYPE_CHECKING:
+    import httpx
+
+try:
+    import ahocorasick
+except ImportError:  # optional "fast" extra; the estimators fall back to substring scans
+    ahocorasick = None
 
 # User agent for requests
 USER_AGENT = (
@@ -18,16 +28,223 @@ USER_AGENT = (
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 )
 
+# Shared HTTP client so repeated fetches reuse pooled keep-alive connections
+_CLIENT: "httpx.AsyncClient | None" = None
+
+# Parsed recipes are reused for an hour, keyed by canonical URL
+RECIPE_CACHE_SIZE = 256
+RECIPE_CACHE_TTL_SECONDS = 3600.0
+
+# Servings count in yields strings like "4 servings", and the number in nutrient values
+_YIELDS_RE = re.compile(r"(\d+)")
+_NUMERIC_RE = re.compile(r"([\d.]+)")
+
+# Keyword tables for the estimators. Order is priority: the first label with a match wins.
+_MEAL_TYPE_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "Breakfast": (
+        "breakfast",
+        "pancake",
+        "waffle",
+        "oatmeal",
+        "egg",
+        "bacon",
+        "french toast",
+        "muffin",
+        "smoothie",
+        "cereal",
+        "granola",
+        "omelet",
+        "frittata",
+        "hash brown",
+    ),
+    "Dessert": (
+        "cake",
+        "cookie",
+        "brownie",
+        "pie",
+        "ice cream",
+        "dessert",
+        "chocolate",
+        "pudding",
+        "cheesecake",
+        "tart",
+        "sweet",
+        "candy",
+        "frosting",
+        "cupcake",
+    ),
+    "Snack": ("snack", "dip", "appetizer", "chip", "popcorn", "bite"),
+}
+
+_CUISINE_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "Mexican": (
+        "taco",
+        "burrito",
+        "enchilada",
+        "salsa",
+        "tortilla",
+        "jalapeño",
+        "cilantro",
+        "cumin",
+        "mexican",
+    ),
+    "Italian": (
+        "pasta",
+        "pizza",
+        "risotto",
+        "parmesan",
+        "marinara",
+        "italian",
+        "basil",
+        "oregano",
+    ),
+    "Chinese": ("soy sauce", "wok", "stir fry", "chinese", "ginger", "sesame", "bok choy"),
+    "Japanese": ("sushi", "ramen", "miso", "japanese", "teriyaki", "wasabi", "nori"),
+    "Indian": ("curry", "masala", "tikka", "indian", "turmeric", "garam", "naan", "paneer"),
+    "Thai": ("thai", "coconut milk", "fish sauce", "lemongrass", "pad thai", "basil"),
+    "Mediterranean": ("mediterranean", "hummus", "falafel", "tahini", "olive", "feta"),
+    "Korean": ("korean", "kimchi", "gochujang", "bulgogi", "bibimbap"),
+    "American": ("burger", "bbq", "mac and cheese", "american", "hot dog"),
+    "Greek": ("greek", "tzatziki", "gyro", "feta", "yogurt"),
+    "French": ("french", "croissant", "baguette", "brie", "coq au vin"),
+}
+
+
+def _build_automaton(table: dict[str, tuple[str, ...]]) -> "ahocorasick.Automaton":
+    """Build an Aho-Corasick automaton mapping each keyword to (priority, label)."""
+    automaton = ahocorasick.Automaton()
+    for priority, (label, keywords) in enumerate(table.items()):
+        for keyword in keywords:
+            # Keywords listed under several labels (e.g. "basil") keep the earliest one
+            if keyword not in automaton:
+                automaton.add_word(keyword, (priority, label))
+    automaton.make_automaton()
+    return automaton
+
+
+def _best_match(automaton: "ahocorasick.Automaton", text: str) -> tuple[int, str] | None:
+    """Return the highest-priority (priority, label) matched anywhere in text, if any."""
+    best = None
+    for _, value in automaton.iter(text):
+        if best is None or value < best:
+            best = value
+            if best[0] == 0:
+                break
+    return best
+
+
+def _single_words(table: dict[str, tuple[str, ...]]) -> dict[str, frozenset[str]]:
+    """Per label, the keywords that are a single word (checkable against a token set)."""
+    return {
+        label: frozenset(kw for kw in keywords if " " not in kw)
+        for label, keywords in table.items()
+    }
+
+
+def _has_keyword(
+    keywords: tuple[str, ...], single_words: frozenset[str], tokens: set[str], text: str
+) -> bool:
+    """
+    Check whether any keyword occurs in text.
+
+    An exact word match is found with one set lookup; only when that misses does it fall
+    back to substring scans, which also catch plurals ("tacos") and multi-word phrases.
+    """
+    return not tokens.isdisjoint(single_words) or any(kw in text for kw in keywords)
+
+
+_MEAL_TYPE_WORDS = _single_words(_MEAL_TYPE_KEYWORDS)
+_CUISINE_WORDS = _single_words(_CUISINE_KEYWORDS)
+
+# One pass over the text per estimate when the optional pyahocorasick extra is installed
+if ahocorasick is not None:
+    _MEAL_TYPE_AUTOMATON = _build_automaton(_MEAL_TYPE_KEYWORDS)
+    _CUISINE_AUTOMATON = _build_automaton(_CUISINE_KEYWORDS)
+else:
+    _MEAL_TYPE_AUTOMATON = _CUISINE_AUTOMATON = None
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL for cache lookups.
+
+    Lowercases the scheme and host, drops the fragment and strips utm_* tracking
+    parameters, so links shared from different places map to the same recipe.
+    """
+    parts = urlsplit(url.strip())
+    query = urlencode(
+        [
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith("utm_")
+        ]
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+
+def _async_ttl_cache(
+    maxsize: int, ttl: float, key: Callable[[str], str]
+) -> Callable[[Callable[[str], Awaitable[Any]]], Callable[[str], Awaitable[Any]]]:
+    """
+    Memoize a single-argument coroutine function with LRU eviction and a time-to-live.
+
+    Concurrent calls for the same key share one in-flight call instead of each doing
+    the work, and it runs to completion (and is cached) even if its callers are cancelled.
+    Exceptions are not cached, so a failed call is retried next time.
+
+    Args:
+        maxsize: Maximum number of cached results
+        ttl: Seconds a result stays valid
+        key: Maps the argument to its cache key
+
+    Returns:
+        Decorator; the wrapped function gains a cache_clear() method
+    """
+
+    def decorator(func: Callable[[str], Awaitable[Any]]) -> Callable[[str], Awaitable[Any]]:
+        cache: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        in_flight: dict[str, asyncio.Future] = {}
+
+        @functools.wraps(func)
+        async def wrapper(arg: str) -> Any:
+            cache_key = key(arg)
+            hit = cache.get(cache_key)
+            if hit is not None and hit[0] > time.monotonic():
+                cache.move_to_end(cache_key)
+                return hit[1]
+
+            pending = in_flight.get(cache_key)
+            if pending is None:
+                pending = asyncio.ensure_future(func(arg))
+                in_flight[cache_key] = pending
+                pending.add_done_callback(functools.partial(_finish, cache_key))
+            # Every caller, the first included, awaits through a shield so one of them being
+            # cancelled doesn't cancel the shared call; _finish caches it regardless
+            return await asyncio.shield(pending)
+
+        def _finish(cache_key: str, task: asyncio.Future) -> None:
+            if in_flight.get(cache_key) is task:
+                del in_flight[cache_key]
+            if task.cancelled() or task.exception() is not None:
+                return
+            cache[cache_key] = (time.monotonic() + ttl, task.result())
+            cache.move_to_end(cache_key)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
 
 def extract_domain(url: str) -> str:
     """Extract domain name from URL for source_name."""
     parsed = urlparse(url)
-    domain = parsed.netloc.replace("www.", "")
+    domain = parsed.netloc.removeprefix("www.")
     # Capitalize nicely
-    parts = domain.split(".")
-    if len(parts) >= 2:
-        return parts[0].title()
-    return domain.title()
+    head, sep, _ = domain.partition(".")
+    return head.title() if sep else domain.title()
 
 
 def parse_ingredient(raw: str) -> RecipeIngredient:
@@ -41,7 +258,8 @@ def parse_ingredient(raw: str) -> RecipeIngredient:
 
     # Simple extraction - just store raw text for now
     # More sophisticated parsing could be added later
-    return RecipeIngredient(
+    # Fields are plain strings we produced, so skip validation
+    return RecipeIngredient.model_construct(
         name=raw,
         raw_text=raw,
     )
@@ -52,49 +270,41 @@ def estimate_meal_type(recipe_name: str, ingredients: list[str]) -> Optional[str
     name_lower = recipe_name.lower()
     ingredients_text = " ".join(ingredients).lower()
 
+    # Breakfast looks at the name plus the start of the ingredients; the rest only at the name.
+    # The newline keeps multi-word keywords from matching across the two ("french" + "toast")
+    haystack = f"{name_lower}\n{ingredients_text[:200]}"
+
+    if _MEAL_TYPE_AUTOMATON is not None:
+        name_end = len(name_lower)
+        best = None
+        for end, value in _MEAL_TYPE_AUTOMATON.iter(haystack):
+            if value[0] == 0:
+                return value[1]
+            if end < name_end and (best is None or value < best):
+                best = value
+        return best[1] if best is not None else "Dinner"
+
+    name_tokens = set(name_lower.split())
+
     # Breakfast indicators
-    breakfast_keywords = [
-        "breakfast",
-        "pancake",
-        "waffle",
-        "oatmeal",
-        "egg",
-        "bacon",
-        "french toast",
-        "muffin",
-        "smoothie",
-        "cereal",
-        "granola",
-        "omelet",
-        "frittata",
-        "hash brown",
-    ]
-    if any(kw in name_lower or kw in ingredients_text[:200] for kw in breakfast_keywords):
+    if _has_keyword(
+        _MEAL_TYPE_KEYWORDS["Breakfast"],
+        _MEAL_TYPE_WORDS["Breakfast"],
+        set(haystack.split()),
+        haystack,
+    ):
         return "Breakfast"
 
     # Dessert indicators
-    dessert_keywords = [
-        "cake",
-        "cookie",
-        "brownie",
-        "pie",
-        "ice cream",
-        "dessert",
-        "chocolate",
-        "pudding",
-        "cheesecake",
-        "tart",
-        "sweet",
-        "candy",
-        "frosting",
-        "cupcake",
-    ]
-    if any(kw in name_lower for kw in dessert_keywords):
+    if _has_keyword(
+        _MEAL_TYPE_KEYWORDS["Dessert"], _MEAL_TYPE_WORDS["Dessert"], name_tokens, name_lower
+    ):
         return "Dessert"
 
     # Snack indicators
-    snack_keywords = ["snack", "dip", "appetizer", "chip", "popcorn", "bite"]
-    if any(kw in name_lower for kw in snack_keywords):
+    if _has_keyword(
+        _MEAL_TYPE_KEYWORDS["Snack"], _MEAL_TYPE_WORDS["Snack"], name_tokens, name_lower
+    ):
         return "Snack"
 
     # Default to Dinner for main dishes
@@ -105,48 +315,41 @@ def estimate_cuisine(recipe_name: str, ingredients: list[str]) -> Optional[str]:
     """Estimate cuisine type from recipe name and ingredients."""
     name_lower = recipe_name.lower()
     ingredients_text = " ".join(ingredients).lower()
-    combined = f"{name_lower} {ingredients_text}"
-
-    cuisine_indicators = {
-        "Mexican": [
-            "taco",
-            "burrito",
-            "enchilada",
-            "salsa",
-            "tortilla",
-            "jalapeño",
-            "cilantro",
-            "cumin",
-            "mexican",
-        ],
-        "Italian": [
-            "pasta",
-            "pizza",
-            "risotto",
-            "parmesan",
-            "marinara",
-            "italian",
-            "basil",
-            "oregano",
-        ],
-        "Chinese": ["soy sauce", "wok", "stir fry", "chinese", "ginger", "sesame", "bok choy"],
-        "Japanese": ["sushi", "ramen", "miso", "japanese", "teriyaki", "wasabi", "nori"],
-        "Indian": ["curry", "masala", "tikka", "indian", "turmeric", "garam", "naan", "paneer"],
-        "Thai": ["thai", "coconut milk", "fish sauce", "lemongrass", "pad thai", "basil"],
-        "Mediterranean": ["mediterranean", "hummus", "falafel", "tahini", "olive", "feta"],
-        "Korean": ["korean", "kimchi", "gochujang", "bulgogi", "bibimbap"],
-        "American": ["burger", "bbq", "mac and cheese", "american", "hot dog"],
-        "Greek": ["greek", "tzatziki", "gyro", "feta", "yogurt"],
-        "French": ["french", "croissant", "baguette", "brie", "coq au vin"],
-    }
 
-    for cuisine, keywords in cuisine_indicators.items():
-        if any(kw in combined for kw in keywords):
-            return cuisine
+    # The title usually carries the cuisine ("Thai Basil Chicken"), so try that short string
+    # first and only scan the much longer ingredient text when it has no signal.
+    if _CUISINE_AUTOMATON is not None:
+        best = _best_match(_CUISINE_AUTOMATON, name_lower)
+        if best is None:
+            best = _best_match(_CUISINE_AUTOMATON, ingredients_text)
+        return best[1] if best is not None else None
+
+    for text in (name_lower, ingredients_text):
+        tokens = set(text.split())
+        for cuisine, keywords in _CUISINE_KEYWORDS.items():
+            if _has_keyword(keywords, _CUISINE_WORDS[cuisine], tokens, text):
+                return cuisine
 
     return None
 
 
+def _to_minutes(val: Any) -> Optional[int]:
+    """Coerce a scraped duration to whole minutes, or None if it isn't a usable number."""
+    if val is None:
+        return None
+    # recipe-scrapers usually returns int; checked before the rarer float and str forms
+    if type(val) is int:
+        return val
+    if isinstance(val, float):
+        return int(val) if math.isfinite(val) else None
+    if isinstance(val, str):
+        val = val.strip()
+        # isdigit alone admits non-ASCII digits like "²" that int() rejects
+        if val.isascii() and val.isdigit():
+            return int(val)
+    return None
+
+
 def estimate_difficulty(prep_time: Optional[int], cook_time: Optional[int], num_steps: int) -> str:
     """Estimate recipe difficulty."""
     total_time = (prep_time or 0) + (cook_time or 0)
@@ -159,10 +362,50 @@ def estimate_difficulty(prep_time: Optional[int], cook_time: Optional[int], num_
         return "Hard"
 
 
+def _get_client() -> "httpx.AsyncClient":
+    """Get the shared HTTP client, creating it on first use (or after close_client)."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        import httpx
+
+        _CLIENT = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+            timeout=30.0,
+        )
+    return _CLIENT
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client (for graceful shutdown)."""
+    global _CLIENT
+    client, _CLIENT = _CLIENT, None
+    if client is not None:
+        await client.aclose()
+
+
+async def parse_recipe_urls(urls: list[str]) -> list[Recipe | Exception]:
+    """
+    Parse several recipe URLs concurrently over the shared connection pool.
+
+    Args:
+        urls: URLs to recipe pages
+
+    Returns:
+        One entry per URL, in order: the parsed Recipe, or the exception (usually a
+        ValueError) raised while fetching or parsing it
+    """
+    return await asyncio.gather(*(parse_recipe_url(url) for url in urls), return_exceptions=True)
+
+
+@_async_ttl_cache(RECIPE_CACHE_SIZE, RECIPE_CACHE_TTL_SECONDS, key=canonical_url)
 async def parse_recipe_url(url: str) -> Recipe:
     """
     Parse a recipe from a URL using recipe-scrapers.
 
+    Results are cached for RECIPE_CACHE_TTL_SECONDS by canonical URL, and the cached
+    Recipe is shared between callers, so treat it as read-only.
+
     Args:
         url: URL to a recipe page
 
@@ -172,19 +415,32 @@ async def parse_recipe_url(url: str) -> Recipe:
     Raises:
         ValueError: If the URL cannot be parsed or website is not supported
     """
+    import httpx
+
     # Fetch the HTML
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                url,
-                headers={"User-Agent": USER_AGENT},
-                follow_redirects=True,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            html = response.text
-        except httpx.HTTPError as e:
-            raise ValueError(f"Failed to fetch URL: {e}")
+    try:
+        response = await _get_client().get(url)
+        response.raise_for_status()
+        # Decoded once here: scrape_html takes str, and some site scrapers run str regexes
+        # over the raw page, so passing response.content through is not safe
+        html = response.text
+    except httpx.HTTPError as e:
+        raise ValueError(f"Failed to fetch URL: {e}")
+
+    # Scraping (HTML parsing, extraction, estimates) is CPU-bound; run it in a worker thread
+    # so the event loop keeps serving other fetches, e.g. the rest of parse_recipe_urls
+    return await asyncio.to_thread(_scrape_recipe, html, url)
+
+
+def _scrape_recipe(html: str, url: str) -> Recipe:
+    """
+    Build a Recipe from a fetched page with recipe-scrapers.
+
+    Raises:
+        ValueError: If the page cannot be parsed or the website is not supported
+    """
+    from recipe_scrapers import scrape_html
+    from recipe_scrapers._exceptions import WebsiteNotImplementedError
 
     # Parse with recipe-scrapers
     try:
@@ -213,9 +469,7 @@ async def parse_recipe_url(url: str) -> Recipe:
     if isinstance(instructions_raw, str):
         # Split by newlines or numbered steps
         instructions = [
-            step.strip()
-            for step in instructions_raw.replace("\n\n", "\n").split("\n")
-            if step.strip()
+            step for step in (line.strip() for line in instructions_raw.splitlines()) if step
         ]
     else:
         instructions = instructions_raw or []
@@ -229,29 +483,16 @@ async def parse_recipe_url(url: str) -> Recipe:
     total_time = safe_get(scraper.total_time)
 
     # Convert timing to minutes if needed
-    def to_minutes(val) -> Optional[int]:
-        if val is None:
-            return None
-        if isinstance(val, int):
-            return val
-        # recipe-scrapers usually returns int, but handle string just in case
-        try:
-            return int(val)
-        except (ValueError, TypeError):
-            return None
-
-    prep_time_min = to_minutes(prep_time)
-    cook_time_min = to_minutes(cook_time)
-    total_time_min = to_minutes(total_time)
+    prep_time_min = _to_minutes(prep_time)
+    cook_time_min = _to_minutes(cook_time)
+    total_time_min = _to_minutes(total_time)
 
     # Get servings
     servings = None
     yields = safe_get(scraper.yields)
     if yields:
         # Try to extract number from yields string like "4 servings"
-        import re
-
-        match = re.search(r"(\d+)", str(yields))
+        match = _YIELDS_RE.search(str(yields))
         if match:
             servings = int(match.group(1))
 
@@ -269,10 +510,10 @@ async def parse_recipe_url(url: str) -> Recipe:
             val = nutrients.get(key)
             if val is None:
                 return None
+            if isinstance(val, (int, float)):
+                return float(val)
             # Remove units and convert to float
-            import re
-
-            match = re.search(r"([\d.]+)", str(val))
+            match = _NUMERIC_RE.search(val if isinstance(val, str) else str(val))
             if match:
                 return float(match.group(1))
             return None
@@ -0,0 +1,25 @@
+"""Shared fixtures for the PrepWise test suite."""
+
+import pytest
+
+from prepwise.storage import json_store, paths
+from prepwise.tools import preferences
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point every PrepWise data path at a fresh temporary directory."""
+    monkeypatch.setattr(paths, "PREPWISE_DIR", tmp_path)
+    monkeypatch.setattr(preferences, "PREFERENCES_FILE", tmp_path / "preferences.json")
+    monkeypatch.setattr(preferences, "PREFERENCES_JOURNAL_FILE", tmp_path / "preferences.json.log")
+    monkeypatch.setattr(paths, "SETUP_COMPLETE_FILE", tmp_path / "setup_complete")
+
+    json_store._CACHE.clear()
+    preferences.get_preferences_store.cache_clear()
+    preferences.get_preferences_journal.cache_clear()
+    preferences._JOURNAL_STATE.update(profile=None, persisted=None)
+    yield tmp_path
+    json_store._CACHE.clear()
+    preferences.get_preferences_store.cache_clear()
+    preferences.get_preferences_journal.cache_clear()
+    preferences._JOURNAL_STATE.update(profile=None, persisted=None)
@@ -0,0 +1,94 @@
+"""Tests for HEB browser tab handling, with a fake Playwright context."""
+
+import asyncio
+
+import pytest
+
+from prepwise.tools import heb_cart
+
+
+class _FakePage:
+    def __init__(self, name: str):
+        self.name = name
+        self.visited: list[str] = []
+        self.closed = False
+
+    async def goto(self, url: str, timeout: int = 0) -> None:
+        self.visited.append(url)
+
+    async def wait_for_load_state(self, *args, **kwargs) -> None:
+        pass
+
+    def locator(self, selector: str) -> "_FakeLocator":
+        return _FakeLocator()
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeLocator:
+    first = property(lambda self: self)
+
+    async def count(self) -> int:
+        return 0
+
+
+class _FakeContext:
+    def __init__(self, *pages: _FakePage):
+        self.pages = list(pages)
+        self.opened: list[_FakePage] = []
+
+    async def new_page(self) -> _FakePage:
+        page = _FakePage(f"new-{len(self.opened)}")
+        self.pages.append(page)
+        self.opened.append(page)
+        return page
+
+
+@pytest.fixture
+def fake_context(monkeypatch):
+    """Shared context that already holds another call's tab."""
+    context = _FakeContext(_FakePage("cart-review"), _FakePage("session-check"))
+
+    async def get_browser_context(headless: bool = False):
+        return None, context
+
+    async def release_browser_context() -> None:
+        pass
+
+    monkeypatch.setattr(heb_cart, "get_browser_context", get_browser_context)
+    monkeypatch.setattr(heb_cart, "release_browser_context", release_browser_context)
+    return context
+
+
+def test_open_heb_login_uses_its_own_tab(fake_context):
+    existing = list(fake_context.pages)
+
+    asyncio.run(heb_cart.open_heb_login())
+
+    assert all(page.visited == [] for page in existing)
+    assert [page.visited for page in fake_context.opened] == [[heb_cart.HEB_LOGIN_URL]]
+
+
+def test_add_items_to_cart_reviews_the_cart_in_a_new_tab(fake_context, monkeypatch):
+    login = _FakePage("login")
+    fake_context.pages.insert(0, login)
+    existing = list(fake_context.pages)
+    item_tabs: list[_FakePage] = []
+
+    async def add_single_item(page, ingredient):
+        item_tabs.append(page)
+        return heb_cart.HEBCartItem(search_term=ingredient, success=True)
+
+    monkeypatch.setattr(heb_cart, "_add_single_item", add_single_item)
+    # No human-like delay between items
+    monkeypatch.setattr(heb_cart.random, "uniform", lambda a, b: 0)
+
+    result = asyncio.run(heb_cart.add_items_to_cart(["1 onion", "2 carrots"]))
+
+    assert result.total_added == 2
+    assert all(page.visited == [] and not page.closed for page in existing)
+    assert all(tab.closed for tab in item_tabs)
+    (cart_tab,) = [page for page in fake_context.opened if page not in item_tabs]
+    assert cart_tab.visited == [heb_cart.HEB_CART_URL]
+    assert not cart_tab.closed
@@ -0,0 +1,45 @@
+"""Tests for the JSON file store."""
+
+import os
+
+import pytest
+from pydantic import BaseModel
+
+from prepwise.storage.json_store import JSONStore
+
+
+class _Counter(BaseModel):
+    value: int = 0
+
+
+def test_load_returns_cached_instance_until_file_changes(data_dir):
+    store = JSONStore(data_dir / "counter.json", _Counter)
+    store.save(_Counter(value=1))
+
+    first = store.load()
+    assert store.load() is first
+
+    (data_dir / "counter.json").write_text('{"value": 5}')
+    os.utime(data_dir / "counter.json", ns=(0, 0))
+    assert store.load().value == 5
+
+
+def test_failed_save_drops_the_mutated_cached_instance(data_dir, monkeypatch):
+    store = JSONStore(data_dir / "counter.json", _Counter)
+    store.save(_Counter(value=1))
+
+    model = store.load()
+    model.value = 2
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as m:
+        m.setattr(os, "replace", fail_replace)
+        with pytest.raises(OSError):
+            store.save(model)
+
+    reloaded = store.load()
+    assert reloaded is not model
+    assert reloaded.value == 1
+    assert not (data_dir / "counter.json.tmp").exists()
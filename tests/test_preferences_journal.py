@@ -0,0 +1,144 @@
+"""Tests for journaled preference saves against a real data directory."""
+
+import json
+import os
+
+import pytest
+
+from prepwise.storage import json_store
+from prepwise.tools import preferences
+
+
+def _restart() -> None:
+    """Forget everything held in memory, as a fresh server process would."""
+    json_store._CACHE.clear()
+    preferences._JOURNAL_STATE.update(profile=None, persisted=None)
+
+
+def _journal_lines(data_dir) -> list[str]:
+    return (data_dir / "preferences.json.log").read_text().splitlines()
+
+
+def _snapshot(data_dir) -> dict:
+    return json.loads((data_dir / "preferences.json").read_text())
+
+
+@pytest.fixture
+def snapshot_prefs(data_dir):
+    """Profile with a snapshot on disk and an empty journal."""
+    prefs = preferences.complete_setup()
+    assert (data_dir / "preferences.json").exists()
+    assert not (data_dir / "preferences.json.log").exists()
+    return prefs
+
+
+def test_edits_are_journaled_and_replayed(data_dir, snapshot_prefs):
+    preferences.update_preference("ingredient", "Cilantro", 2)
+    preferences.update_macro_targets(daily_calories=1800)
+
+    lines = _journal_lines(data_dir)
+    assert json.loads(lines[0])["op"] == "base"
+    assert "cilantro" not in _snapshot(data_dir)["ingredients"]
+
+    _restart()
+    prefs = preferences.load_preferences()
+    assert prefs.ingredients["cilantro"] == 2
+    assert prefs.macro_targets.daily_calories == 1800
+
+
+def test_journal_is_ignored_after_snapshot_changes(data_dir, snapshot_prefs):
+    preferences.update_preference("ingredient", "cilantro", 2)
+
+    # Hand edit of the snapshot after the journal was written
+    snapshot = _snapshot(data_dir)
+    snapshot["ingredients"]["cilantro"] = -2
+    path = data_dir / "preferences.json"
+    path.write_text(json.dumps(snapshot))
+    os.utime(path, ns=(0, 0))
+
+    assert preferences.load_preferences().ingredients["cilantro"] == -2
+    assert not (data_dir / "preferences.json.log").exists()
+    assert (data_dir / "preferences.json.log.stale").exists()
+
+    # New edits start a journal against the edited snapshot
+    preferences.update_preference("cuisine", "thai", 1)
+    _restart()
+    prefs = preferences.load_preferences()
+    assert prefs.ingredients["cilantro"] == -2
+    assert prefs.cuisines["Thai"] == 1
+
+
+def test_torn_last_line_is_skipped_and_next_append_starts_fresh(data_dir, snapshot_prefs):
+    preferences.update_preference("ingredient", "cilantro", 2)
+    with open(data_dir / "preferences.json.log", "ab") as f:
+        f.write(b'{"op":"set","cat":"ingredient","key":"ba')
+
+    _restart()
+    prefs = preferences.load_preferences()
+    assert prefs.ingredients == {"cilantro": 2}
+
+    preferences.update_preference("ingredient", "basil", 1)
+    assert _journal_lines(data_dir)[-1] == '{"op":"set","cat":"ingredient","key":"basil","val":1}'
+
+    _restart()
+    assert preferences.load_preferences().ingredients == {"cilantro": 2, "basil": 1}
+
+
+def test_bad_records_are_kept_aside_and_good_ones_compacted(data_dir, snapshot_prefs):
+    preferences.update_preference("ingredient", "cilantro", 2)
+    with open(data_dir / "preferences.json.log", "ab") as f:
+        f.write(b'{"op":"set","cat":"ingredient","key":"x","val":"lots"}\n')
+
+    _restart()
+    prefs = preferences.load_preferences()
+    assert prefs.ingredients == {"cilantro": 2}
+    assert _snapshot(data_dir)["ingredients"] == {"cilantro": 2}
+    assert not (data_dir / "preferences.json.log").exists()
+    assert '"val":"lots"' in (data_dir / "preferences.json.log.bad").read_text()
+
+
+def test_save_compacts_only_past_the_threshold(data_dir, snapshot_prefs, monkeypatch):
+    preferences.update_preference("ingredient", "item_0", 1)
+    size = (data_dir / "preferences.json.log").stat().st_size
+    record_size = len(b'{"op":"set","cat":"ingredient","key":"item_1","val":1}\n')
+
+    # Exactly at the limit after the next append: the journal is kept
+    monkeypatch.setattr(preferences, "JOURNAL_COMPACT_BYTES", size + record_size)
+    preferences.update_preference("ingredient", "item_1", 1)
+    assert (data_dir / "preferences.json.log").stat().st_size == size + record_size
+    assert "item_1" not in _snapshot(data_dir)["ingredients"]
+
+    # One more byte over: the save folds everything into the snapshot
+    preferences.update_preference("ingredient", "item_2", 1)
+    assert not (data_dir / "preferences.json.log").exists()
+    assert _snapshot(data_dir)["ingredients"] == {"item_0": 1, "item_1": 1, "item_2": 1}
+
+
+def test_load_compacts_only_past_the_threshold(data_dir, snapshot_prefs, monkeypatch):
+    preferences.update_preference("ingredient", "cilantro", 2)
+    size = (data_dir / "preferences.json.log").stat().st_size
+
+    monkeypatch.setattr(preferences, "JOURNAL_COMPACT_BYTES", size)
+    _restart()
+    preferences.load_preferences()
+    assert (data_dir / "preferences.json.log").exists()
+
+    monkeypatch.setattr(preferences, "JOURNAL_COMPACT_BYTES", size - 1)
+    _restart()
+    preferences.load_preferences()
+    assert not (data_dir / "preferences.json.log").exists()
+    assert _snapshot(data_dir)["ingredients"] == {"cilantro": 2}
+
+
+def test_failed_append_drops_the_unsaved_edit(data_dir, snapshot_prefs, monkeypatch):
+    journal = preferences.get_preferences_journal()
+
+    def fail_append(records):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as m:
+        m.setattr(journal, "append", fail_append)
+        with pytest.raises(OSError):
+            preferences.update_preference("ingredient", "cilantro", 2)
+
+    assert "cilantro" not in preferences.load_preferences().ingredients